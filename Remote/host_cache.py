@@ -0,0 +1,72 @@
+"""On-disk cache of probed host facts (OS type, Java version) shared across runs."""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+import threading
+import time
+from typing import Any, Dict
+
+STATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "state")
+TTL_SECONDS = 24 * 60 * 60
+
+
+def safe_host_name(host: str) -> str:
+    """``host`` with anything unsafe in a file name replaced, for per-host files under STATE_DIR."""
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", host)
+
+
+def _cache_path(host: str) -> str:
+    return os.path.join(STATE_DIR, f"{safe_host_name(host)}.facts.json")
+
+
+def load(host: str, fingerprint: str) -> Dict[str, Any]:
+    """Return cached facts for ``host``; empty when missing, expired, or the host key changed."""
+    try:
+        with open(_cache_path(host), encoding="utf-8") as handle:
+            entry = json.load(handle)
+    except (OSError, ValueError):
+        return {}
+    if entry.get("fingerprint") != fingerprint or time.time() - entry.get("verified", 0) > TTL_SECONDS:
+        return {}
+    return dict(entry.get("facts") or {})
+
+
+def update(host: str, fingerprint: str, **facts: Any) -> None:
+    """Merge ``facts`` into the host's entry, restarting its TTL.
+
+    Best-effort: when the state directory cannot be written the facts are simply not
+    persisted, and callers keep whatever they hold in memory.
+    """
+    current = load(host, fingerprint)
+    current.update(facts)
+    entry = {"fingerprint": fingerprint, "verified": time.time(), "facts": current}
+    path = _cache_path(host)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(STATE_DIR, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump(entry, handle)
+        os.replace(tmp_path, path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+def clear(host: str | None = None) -> None:
+    """Forget one host's facts, or every host's when ``host`` is None."""
+    if host is not None:
+        paths = [_cache_path(host)]
+    elif os.path.isdir(STATE_DIR):
+        paths = [os.path.join(STATE_DIR, name) for name in os.listdir(STATE_DIR) if name.endswith(".facts.json")]
+    else:
+        paths = []
+    for path in paths:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
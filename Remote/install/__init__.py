@@ -1,9 +1,18 @@
 """Installation tools for remote Tomcat automation."""
 
-from .remote_tomcat_install import RemoteTomcatInstallTool
-from .remote_tomcat_uninstall import RemoteTomcatUninstallTool
+import importlib
 
-__all__ = [
-	"RemoteTomcatInstallTool",
-	"RemoteTomcatUninstallTool",
-]
+# Loaded on first access, like the pre_install and post_install packages
+_EXPORTS = {
+	"RemoteTomcatInstallTool": ".remote_tomcat_install",
+	"RemoteTomcatUninstallTool": ".remote_tomcat_uninstall",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return getattr(importlib.import_module(module, __name__), name)
@@ -0,0 +1,34 @@
+"""Local markers recording which hosts this controller installed Tomcat on."""
+
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from Remote.host_cache import STATE_DIR, safe_host_name
+
+
+def _marker_path(host: str) -> str:
+    return os.path.join(STATE_DIR, f"{safe_host_name(host)}.installed")
+
+
+def mark_installed(host: str, tomcat_home: str) -> None:
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(_marker_path(host), "w", encoding="utf-8") as handle:
+        handle.write(tomcat_home)
+
+
+def installed_home(host: str) -> Optional[str]:
+    """Return the recorded Tomcat home for ``host``, or ``None`` when there is no marker."""
+    try:
+        with open(_marker_path(host), encoding="utf-8") as handle:
+            return handle.read().strip()
+    except FileNotFoundError:
+        return None
+
+
+def clear_installed(host: str) -> None:
+    try:
+        os.remove(_marker_path(host))
+    except FileNotFoundError:
+        pass
@@ -1,14 +1,17 @@
-import os
-from typing import Dict, Any
+import shlex
+from pathlib import PurePosixPath, PureWindowsPath
+from typing import Dict, Any, Sequence
 
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 from Remote.remote_executor import RemoteExecutor
 
+from .install_state import mark_installed
+
 try:
-    from ..utilities.remote_download import RemoteCurlDownloadTool, _to_ps_literal
+    from ..utilities.remote_download import RemoteCurlDownloadTool, _linux_fetch_command, _to_ps_literal
     from ..utilities.remote_extract import RemoteZipExtractTool
 except ImportError:  # pragma: no cover
-    from utilities.remote_download import RemoteCurlDownloadTool, _to_ps_literal  # type: ignore
+    from utilities.remote_download import RemoteCurlDownloadTool, _linux_fetch_command, _to_ps_literal  # type: ignore
     from utilities.remote_extract import RemoteZipExtractTool  # type: ignore
 
 
@@ -16,6 +19,22 @@ class RemoteTomcatInstallTool(RemoteTool):
     """Install Apache Tomcat on a remote host using configuration-driven settings."""
 
     config_path = ("install", "tomcat")
+    __slots__ = ("_download_tool", "_extract_tool")
+
+    # PowerShell statements for run_batch; only the quoted path literal varies.
+    # New-Item -Force is idempotent for directories, so no Test-Path first
+    _ENSURE_DIRS_TMPL = (
+        "@({literals}) | ForEach-Object {{ New-Item -ItemType Directory -Force -Path $_ | Out-Null }}"
+    )
+    _SET_PERMISSIONS_TMPL = (
+        "$bin = {literal}; "
+        "Get-ChildItem $bin -Filter '*.bat' | ForEach-Object {{ $_.Attributes='Normal' }}"
+    )
+    _CLEANUP_TMPL = (
+        "$archive = {literal}; "
+        "foreach ($item in @($archive, ($archive + '.sha256'), ($archive + '.etag'))) "
+        "{{ if (Test-Path $item) {{ Remove-Item -Force $item }} }}"
+    )
 
     def __init__(self) -> None:
         super().__init__(
@@ -28,19 +47,28 @@ class RemoteTomcatInstallTool(RemoteTool):
         self._extract_tool = RemoteZipExtractTool()
 
     def run(self, executor: RemoteExecutor, config: Dict[str, Any]) -> Dict[str, Any]:
-        logs = []
+        logs = LogBuffer()
         try:
             logs.append("Detecting remote operating system...")
             os_type = executor.detect_os()
             logs.append(f"✔ Detected OS: {os_type}")
 
             if os_type == "windows":
-                return self._install_windows(executor, config.get("windows", {}), logs)
-            if os_type == "linux":
-                return self._install_linux(executor, config.get("linux", {}), logs)
-
-            logs.append("Unsupported operating system detected")
-            return self._failure("Unsupported OS", logs)
+                result = self._install_windows(executor, config.get("windows", {}), logs)
+            elif os_type == "linux":
+                result = self._install_linux(executor, config.get("linux", {}), logs)
+            else:
+                logs.append("Unsupported operating system detected")
+                return self._failure("Unsupported OS", logs)
+
+            if result.get("status") == "Success" and result.get("tomcat_home"):
+                try:
+                    mark_installed(executor.host, result["tomcat_home"])
+                except OSError as exc:
+                    # The remote install succeeded; only the local bookkeeping is missing
+                    logs.append(f"Warning: could not record install marker: {exc}")
+                    result["output"] = logs.getvalue()
+            return result
 
         except Exception as exc:  # pragma: no cover - defensive
             logs.append(f"Exception: {exc}")
@@ -60,8 +88,10 @@ class RemoteTomcatInstallTool(RemoteTool):
             return self._missing_config("windows", logs)
 
         # Ensure directories
-        self._ensure_directory(executor, os.path.dirname(archive_path))
-        self._ensure_directory(executor, install_root)
+        executor.run_batch(
+            [self._ensure_directories([str(PureWindowsPath(archive_path).parent), install_root])],
+            "windows",
+        )
 
         logs.append("Downloading Tomcat archive...")
         download_result = self._download_tool.run(
@@ -70,6 +100,9 @@ class RemoteTomcatInstallTool(RemoteTool):
             destination=archive_path,
             min_size=min_size,
             extra_args=cfg.get("curl_extra_args"),
+            expected_sha256=cfg.get("expected_sha256"),
+            etag_cache=bool(cfg.get("etag_cache", False)),
+            download_cache=cfg.get("download_cache") or None,
         )
         download_details = download_result.get("details", "").strip()
         if download_details:
@@ -92,42 +125,31 @@ class RemoteTomcatInstallTool(RemoteTool):
             return self._failure("Extraction failed", logs, extract_result)
 
         folder_name = extract_result.get("metadata", {}).get("folder_name", "")
-        tomcat_dir = self._join_path(install_root, folder_name)
+        tomcat_dir = self._join_path(install_root, folder_name, "windows")
         if not tomcat_dir.strip():
             return self._failure("Unable to resolve Tomcat directory", logs)
 
-        self._set_permissions_windows(executor, tomcat_dir, logs)
+        finalize = [self._set_permissions_windows(tomcat_dir)]
+        logs.append("Set executable attributes for Windows scripts")
 
         if cfg.get("cleanup_archive", True):
             logs.append("Cleaning up archive...")
-            archive_literal = _to_ps_literal(archive_path)
-            executor.run(
-                "powershell -Command \""
-                f"$archive = {archive_literal};"
-                "if (Test-Path $archive) { Remove-Item -Force $archive }"
-                "\""
-            )
+            finalize.append(self._CLEANUP_TMPL.format(literal=_to_ps_literal(archive_path)))
+        executor.run_batch(finalize, "windows")
 
         details = f"Tomcat extracted to {tomcat_dir}"
         return {
             "name": self.name,
             "status": "Success",
             "command": f"Install Tomcat -> {download_url}",
-            "output": "\n".join(filter(None, logs)),
+            "output": logs.getvalue(),
             "details": details,
             "tomcat_home": tomcat_dir,
         }
 
-    def _set_permissions_windows(self, executor: RemoteExecutor, tomcat_dir: str, logs) -> None:
-        bin_literal = _to_ps_literal(os.path.join(tomcat_dir, "bin"))
-        command = (
-            "powershell -Command \""
-            f"$bin = {bin_literal};"
-            "Get-ChildItem $bin -Filter '*.bat' | ForEach-Object { $_.Attributes='Normal' }"
-            "\""
-        )
-        executor.run(command)
-        logs.append("Set executable attributes for Windows scripts")
+    def _set_permissions_windows(self, tomcat_dir: str) -> str:
+        bin_literal = _to_ps_literal(self._join_path(tomcat_dir, "bin", "windows"))
+        return self._SET_PERMISSIONS_TMPL.format(literal=bin_literal)
 
     # ------------------------------------------------------------------
     # Linux install flow
@@ -142,29 +164,61 @@ class RemoteTomcatInstallTool(RemoteTool):
 
         strip_components = int(cfg.get("strip_components", 1))
 
-        logs.append("Preparing directories...")
-        executor.run(f"mkdir -p {install_root}")
-
-        logs.append("Downloading Tomcat archive...")
-        executor.run(f"wget -O {archive_path} {download_url}")
-
-        logs.append("Extracting archive...")
         tar_cmd = "tar -xzf" if archive_path.endswith(".gz") else "tar -xf"
-        executor.run(f"{tar_cmd} {archive_path} -C {install_root} --strip-components={strip_components}")
-
-        if cfg.get("cleanup_archive", True):
-            executor.run(f"rm -f {archive_path}")
-
+        if archive_path.endswith(".gz") and cfg.get("parallel_decompress", True):
+            # pigz runs read, inflate and write on separate threads; plain gzip otherwise
+            tar_cmd = 'tar --use-compress-program="$(command -v pigz || command -v gzip)" -xf'
         tomcat_dir = cfg.get("final_directory") or install_root
+
+        # Single round-trip: each step only runs if the previous one succeeded
+        logs.append("Preparing directories...")
+        steps = [f"mkdir -p {install_root}"]
+        # Checksum verification needs the archive on disk; otherwise pipe straight into tar
+        if cfg.get("stream_extract", True) and not cfg.get("expected_sha256"):
+            logs.append("Streaming Tomcat archive into tar...")
+            fetch = (
+                f"if command -v curl >/dev/null 2>&1; then curl -fsSL {download_url}; "
+                f"else wget -qO- {download_url}; fi"
+            )
+            steps.append(
+                f"( set -o pipefail; {{ {fetch}; }} | {tar_cmd} - -C {install_root} "
+                f"--strip-components={strip_components} )"
+            )
+        else:
+            logs.append("Downloading Tomcat archive...")
+            steps.append(
+                _linux_fetch_command(
+                    download_url,
+                    archive_path,
+                    cfg.get("expected_sha256"),
+                    int(cfg.get("download_connections", 8)),
+                )
+            )
+            logs.append("Extracting archive...")
+            steps.append(f"{tar_cmd} {archive_path} -C {install_root} --strip-components={strip_components}")
+            if cfg.get("cleanup_archive", True):
+                steps.append(f"rm -f {archive_path} {archive_path}.sha256")
         logs.append("Adjusting permissions...")
-        executor.run(f"chmod +x {tomcat_dir}/bin/*.sh")
+        steps.append(f"chmod +x {tomcat_dir}/bin/*.sh")
+        # Report the shell-expanded directory so "~/tomcat" style settings are recorded
+        # (and later uninstalled) as the absolute path they refer to
+        steps.append(f"cd {tomcat_dir} >/dev/null && pwd")
+        results = executor.run_script(steps)
+        for output, _ in results[:-1]:
+            if output.strip():
+                logs.append(output.strip())
+        if len(results) < len(steps) or results[-1][1] != 0:
+            if results and results[-1][0].strip():
+                logs.append(results[-1][0].strip())
+            return self._failure(f"Install step {len(results)} of {len(steps)} failed", logs)
+        tomcat_dir = results[-1][0].strip() or tomcat_dir
 
         details = f"Tomcat extracted to {tomcat_dir}"
         return {
             "name": self.name,
             "status": "Success",
             "command": f"Install Tomcat -> {download_url}",
-            "output": "\n".join(filter(None, logs)),
+            "output": logs.getvalue(),
             "details": details,
             "tomcat_home": tomcat_dir,
         }
@@ -181,29 +235,18 @@ class RemoteTomcatInstallTool(RemoteTool):
             "name": self.name,
             "status": "Failed",
             "command": "remote_tomcat_install",
-            "output": "\n".join(filter(None, logs)),
+            "output": logs.getvalue(),
             "details": message,
         }
         if payload:
             result["payload"] = payload
         return result
 
-    def _ensure_directory(self, executor: RemoteExecutor, path: str) -> None:
-        literal = _to_ps_literal(path)
-        command = (
-            "powershell -Command \""
-            f"$path = {literal};"
-            "if (!(Test-Path -Path $path)) {"
-            "    New-Item -ItemType Directory -Force -Path $path | Out-Null"
-            "}"
-            "\""
-        )
-        executor.run(command)
+    def _ensure_directories(self, paths: Sequence[str]) -> str:
+        return self._ENSURE_DIRS_TMPL.format(literals=", ".join(_to_ps_literal(path) for path in paths))
 
-    def _join_path(self, base: str, leaf: str) -> str:
+    def _join_path(self, base: str, leaf: str, os_type: str) -> str:
         if not leaf:
             return base
-        if base.endswith(("\\", "/")):
-            return f"{base}{leaf}"
-        separator = "\\" if "\\" in base else "/"
-        return f"{base}{separator}{leaf}"
+        path_cls = PureWindowsPath if os_type == "windows" else PurePosixPath
+        return str(path_cls(base, leaf))
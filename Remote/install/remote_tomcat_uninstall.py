@@ -8,11 +8,14 @@ from typing import Any, Dict, List
 from Remote.remote_executor import RemoteExecutor
 from Remote.tool_base import RemoteTool
 
+from .install_state import clear_installed, installed_home
+
 
 class RemoteTomcatUninstallTool(RemoteTool):
     """Remove a Tomcat installation from a remote Windows or Linux host."""
 
     config_path = ("install", "tomcat_uninstall")
+    __slots__ = ()
 
     def __init__(self) -> None:
         super().__init__(
@@ -40,11 +43,23 @@ class RemoteTomcatUninstallTool(RemoteTool):
     ) -> Dict[str, Any]:
         logs: List[str] = []
         try:
+            marker_home = installed_home(executor.host)
+            if config.get("require_install_marker") and marker_home is None:
+                # Nothing was installed from this controller: skip the SSH round-trip entirely
+                logs.append(f"No install marker for {executor.host}")
+                return {
+                    "name": self.name,
+                    "status": "Success",
+                    "command": self.name,
+                    "output": "\n".join(logs),
+                    "details": "Nothing to uninstall",
+                }
+
             os_type = executor.detect_os()
             logs.append(f"Detected OS: {os_type}")
 
             os_cfg = config.get(os_type, {}) if isinstance(config, dict) else {}
-            tomcat_home = tomcat_home or os_cfg.get("tomcat_home") or config.get("tomcat_home")
+            tomcat_home = tomcat_home or marker_home or os_cfg.get("tomcat_home") or config.get("tomcat_home")
             if not tomcat_home:
                 return self._failure("Tomcat home directory not supplied", logs)
 
@@ -55,12 +70,16 @@ class RemoteTomcatUninstallTool(RemoteTool):
 
             if os_type == "windows":
                 logs_dir = os_cfg.get("logs_dir") or config.get("logs_dir")
-                return self._uninstall_windows(executor, tomcat_home, logs_dir, bool(cleanup_choice), logs)
-            if os_type == "linux":
+                result = self._uninstall_windows(executor, tomcat_home, logs_dir, bool(cleanup_choice), logs)
+            elif os_type == "linux":
                 logs_dir = os_cfg.get("logs_dir") or config.get("logs_dir")
-                return self._uninstall_linux(executor, tomcat_home, logs_dir, bool(cleanup_choice), logs)
+                result = self._uninstall_linux(executor, tomcat_home, logs_dir, bool(cleanup_choice), logs)
+            else:
+                return self._failure("Unsupported operating system", logs)
 
-            return self._failure("Unsupported operating system", logs)
+            if result.get("status") == "Success":
+                clear_installed(executor.host)
+            return result
 
         except Exception as exc:  # pragma: no cover - defensive
             logs.append(f"Exception: {exc}")
@@ -78,32 +97,26 @@ class RemoteTomcatUninstallTool(RemoteTool):
         logs: List[str],
     ) -> Dict[str, Any]:
         logs.append(f"Removing directory {tomcat_home}")
-        literal = tomcat_home.replace("'", "''")
-        command = (
-            "powershell -NoProfile -Command "
-            f"if (Test-Path -LiteralPath '{literal}') "
-            f"{{ Remove-Item -LiteralPath '{literal}' -Recurse -Force }}"
-        )
+        targets = [tomcat_home]
+        if cleanup_logs and logs_dir:
+            logs.append(f"Removing logs directory {logs_dir}")
+            targets.append(logs_dir)
+
+        # One PowerShell start-up removes every target
+        statements = []
+        for target in targets:
+            literal = target.replace("'", "''")
+            statements.append(
+                f"if (Test-Path -LiteralPath '{literal}') "
+                f"{{ Remove-Item -LiteralPath '{literal}' -Recurse -Force }}"
+            )
+        command = f"powershell -NoProfile -Command \"& {{ {'; '.join(statements)} }}\""
         stdout, stderr = executor.run(command)
         if stdout.strip():
             logs.append(stdout.strip())
         if stderr.strip():
             logs.append(f"stderr: {stderr.strip()}")
 
-        if cleanup_logs and logs_dir:
-            logs.append(f"Removing logs directory {logs_dir}")
-            literal_logs = logs_dir.replace("'", "''")
-            logs_command = (
-                "powershell -NoProfile -Command "
-                f"if (Test-Path -LiteralPath '{literal_logs}') "
-                f"{{ Remove-Item -LiteralPath '{literal_logs}' -Recurse -Force }}"
-            )
-            stdout, stderr = executor.run(logs_command)
-            if stdout.strip():
-                logs.append(stdout.strip())
-            if stderr.strip():
-                logs.append(f"stderr: {stderr.strip()}")
-
         return {
             "name": self.name,
             "status": "Success",
@@ -124,22 +137,17 @@ class RemoteTomcatUninstallTool(RemoteTool):
         logs: List[str],
     ) -> Dict[str, Any]:
         logs.append(f"Removing directory {tomcat_home}")
-        home_literal = shlex.quote(tomcat_home)
-        stdout, stderr = executor.run(f"rm -rf {home_literal}")
+        targets = [shlex.quote(tomcat_home)]
+        if cleanup_logs and logs_dir:
+            logs.append(f"Removing logs directory {logs_dir}")
+            targets.append(shlex.quote(logs_dir))
+
+        stdout, stderr = executor.run(f"rm -rf {' '.join(targets)}")
         if stdout.strip():
             logs.append(stdout.strip())
         if stderr.strip():
             logs.append(f"stderr: {stderr.strip()}")
 
-        if cleanup_logs and logs_dir:
-            logs.append(f"Removing logs directory {logs_dir}")
-            logs_literal = shlex.quote(logs_dir)
-            stdout, stderr = executor.run(f"rm -rf {logs_literal}")
-            if stdout.strip():
-                logs.append(stdout.strip())
-            if stderr.strip():
-                logs.append(f"stderr: {stderr.strip()}")
-
         return {
             "name": self.name,
             "status": "Success",
@@ -0,0 +1,148 @@
+"""Install Tomcat and run the post-install checks over one connected executor."""
+
+from __future__ import annotations
+
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Sequence
+
+from Remote.remote_executor import RemoteExecutor
+from Remote.pre_install.remote_disk_check import RemoteDiskCheckTool
+from Remote.pre_install.remote_port_check import RemotePortCheckTool
+from Remote.pre_install.remote_ram_check import RemoteRamCheckTool
+
+if TYPE_CHECKING:
+    from Remote.install.remote_tomcat_install import RemoteTomcatInstallTool
+    from Remote.post_install.tomcat_start import RemoteTomcatStartTool
+    from Remote.post_install.tomcat_stop import RemoteTomcatStopTool
+    from Remote.post_install.tomcat_validation import RemoteTomcatValidationTool
+
+
+# Tools are stateless between calls, so one instance serves every host; each is
+# imported on first use so a settings file without that stage never loads it
+@functools.lru_cache(maxsize=None)
+def _install_tool() -> RemoteTomcatInstallTool:
+    from Remote.install.remote_tomcat_install import RemoteTomcatInstallTool
+
+    return RemoteTomcatInstallTool()
+
+
+@functools.lru_cache(maxsize=None)
+def _start_tool() -> RemoteTomcatStartTool:
+    from Remote.post_install.tomcat_start import RemoteTomcatStartTool
+
+    return RemoteTomcatStartTool()
+
+
+@functools.lru_cache(maxsize=None)
+def _validation_tool() -> RemoteTomcatValidationTool:
+    from Remote.post_install.tomcat_validation import RemoteTomcatValidationTool
+
+    return RemoteTomcatValidationTool()
+
+
+@functools.lru_cache(maxsize=None)
+def _stop_tool() -> RemoteTomcatStopTool:
+    from Remote.post_install.tomcat_stop import RemoteTomcatStopTool
+
+    return RemoteTomcatStopTool()
+
+
+# Read-only probes with no ordering between them
+PRE_INSTALL_CHECKS = (RemoteDiskCheckTool(), RemoteRamCheckTool(), RemotePortCheckTool())
+
+
+def run_pre_install(
+    executor: RemoteExecutor,
+    settings: Dict[str, Any],
+    tools: Sequence[Any] = PRE_INSTALL_CHECKS,
+) -> Dict[str, Any]:
+    """Run read-only pre-install checks concurrently on one executor.
+
+    Each tool gets its own channel on the shared SSH transport. Tools without a
+    config section under their ``config_path`` are skipped. Results are keyed
+    ``pre_install_<section>`` (e.g. ``pre_install_ram_check``) in ``tools`` order.
+    """
+    jobs = []
+    for tool in tools:
+        config: Any = settings
+        for key in tool.get_config_path():
+            config = config.get(key) if isinstance(config, dict) else None
+        if config:
+            jobs.append((f"pre_install_{tool.get_config_path()[-1]}", tool, config))
+    if not jobs:
+        return {}
+
+    # Probe the OS once up front so the workers all hit the executor's cache
+    executor.detect_os()
+    with ThreadPoolExecutor(max_workers=len(jobs)) as pool:
+        futures = [(key, pool.submit(tool.run, executor, config)) for key, tool, config in jobs]
+        return {key: future.result() for key, future in futures}
+
+
+def install_and_validate(
+    executor: RemoteExecutor,
+    settings: Dict[str, Any],
+    server: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Run install -> start -> HTTP validation -> stop on an already connected executor.
+
+    Every phase shares the executor's SSH connection and its cached OS detection, and
+    the Tomcat home reported by the install step feeds the post-install tools directly.
+    Returns the per-phase results keyed like :class:`RemoteWorkflowRunner` output.
+    """
+    results: Dict[str, Any] = {}
+
+    install_cfg = settings.get("install", {}).get("tomcat")
+    tomcat_home = None
+    if install_cfg:
+        install_result = _install_tool().run(executor, install_cfg)
+        results["install_tomcat"] = install_result
+        if install_result.get("status") != "Success":
+            return results
+        tomcat_home = install_result.get("tomcat_home")
+
+    post_cfg = settings.get("post_install", {})
+    start_cfg = post_cfg.get("tomcat_start")
+    validation_cfg = post_cfg.get("tomcat_validation")
+    stop_cfg = post_cfg.get("tomcat_stop")
+
+    default_home = post_cfg.get("default_tomcat_home") if isinstance(post_cfg, dict) else None
+    effective_home = (
+        tomcat_home
+        or default_home
+        or (start_cfg or {}).get("tomcat_home")
+        or (validation_cfg or {}).get("tomcat_home")
+        or (stop_cfg or {}).get("tomcat_home")
+    )
+
+    if start_cfg:
+        results["post_install_tomcat_start"] = _start_tool().run(
+            executor=executor,
+            config=start_cfg,
+            tomcat_home=effective_home,
+        )
+
+    if validation_cfg:
+        if effective_home:
+            results["post_install_tomcat_validation"] = _validation_tool().run(
+                executor=executor,
+                config=validation_cfg,
+                server=server,
+                tomcat_home=effective_home,
+            )
+        else:
+            results["post_install_tomcat_validation"] = {
+                "status": "Skipped",
+                "details": "Tomcat home not available for validation",
+            }
+
+    if stop_cfg:
+        results["post_install_tomcat_stop"] = _stop_tool().run(
+            executor=executor,
+            config=stop_cfg,
+            tomcat_home=effective_home,
+        )
+
+    return results
+
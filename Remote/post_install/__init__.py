@@ -1,11 +1,19 @@
 """Post-install remote tools for Apache Tomcat."""
 
-from .tomcat_start import RemoteTomcatStartTool
-from .tomcat_stop import RemoteTomcatStopTool
-from .tomcat_validation import RemoteTomcatValidationTool
-
-__all__ = [
-	"RemoteTomcatStartTool",
-	"RemoteTomcatStopTool",
-	"RemoteTomcatValidationTool",
-]
+import importlib
+
+# Loaded on first access so e.g. the stop tool does not import the validator's HTTP client
+_EXPORTS = {
+	"RemoteTomcatStartTool": ".tomcat_start",
+	"RemoteTomcatStopTool": ".tomcat_stop",
+	"RemoteTomcatValidationTool": ".tomcat_validation",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return getattr(importlib.import_module(module, __name__), name)
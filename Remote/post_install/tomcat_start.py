@@ -3,16 +3,58 @@
 from __future__ import annotations
 
 import shlex
-from typing import Any, Dict, List
+import time
+from typing import Any, Callable, Dict, Optional
 
 from Remote.remote_executor import RemoteExecutor
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 
 
 class RemoteTomcatStartTool(RemoteTool):
     """Start Apache Tomcat on a remote host."""
 
     config_path = ("post_install", "tomcat_start")
+    __slots__ = ("_dispatch",)
+
+    # Script templates are built once; only the paths, port and timeout vary per call
+    _WINDOWS_START_TMPL = (
+        "if (-not (Test-Path '{home}')) {{ Write-Error 'Tomcat directory not found'; exit 1 }}; "
+        "$bin = '{home}\\bin'; "
+        "$startup = Join-Path $bin 'startup.bat'; "
+        "if (-not (Test-Path $startup)) {{ Write-Error 'startup.bat not found'; exit 1 }}; "
+        "Start-Process -FilePath 'cmd.exe' -ArgumentList '/c', $startup -WorkingDirectory $bin -WindowStyle Hidden; "
+        "{ready}"
+    )
+    _WINDOWS_READY_TMPL = (
+        "$port = {port};"
+        "$deadline = (Get-Date).AddSeconds({timeout});"
+        "while ((Get-Date) -lt $deadline) {{"
+        "  $listeners = [System.Net.NetworkInformation.IPGlobalProperties]::GetIPGlobalProperties().GetActiveTcpListeners();"
+        "  if ($listeners | Where-Object {{ $_.Port -eq $port }}) {{"
+        "    Write-Output \"Port $port is listening.\"; exit 0"
+        "  }}"
+        "  Start-Sleep -Milliseconds 100"
+        "}}"
+        "Write-Error \"Tomcat port {port} not listening after {timeout}s\"; exit 1"
+    )
+    _LINUX_START_TMPL = (
+        "if [ ! -d {quoted_root} ]; then "
+        "echo 'Tomcat directory not found: {root}' >&2; exit 1; fi; "
+        "cd {quoted_root}/bin && "
+        "chmod +x startup.sh && "
+        "nohup ./startup.sh >/dev/null 2>&1 & "
+        "{ready}"
+    )
+    # Connecting via bash's /dev/tcp succeeds the moment Tomcat binds; no ss/grep per tick
+    _LINUX_READY_TMPL = (
+        "end=$((SECONDS+{timeout}));"
+        "while [ $SECONDS -lt $end ]; do "
+        "if (: <>/dev/tcp/127.0.0.1/{port}) 2>/dev/null; then "
+        "echo 'Port {port} is listening.'; exit 0; fi; "
+        "sleep 0.1;"
+        "done;"
+        "echo 'Tomcat port {port} not listening after {timeout}s' 1>&2; exit 1"
+    )
 
     def __init__(self) -> None:
         super().__init__(
@@ -26,6 +68,7 @@ class RemoteTomcatStartTool(RemoteTool):
                 },
             },
         )
+        self._dispatch = {"windows": self._start_windows, "linux": self._start_linux}
 
     def run(
         self,
@@ -33,51 +76,50 @@ class RemoteTomcatStartTool(RemoteTool):
         config: Dict[str, Any],
         tomcat_home: str | None = None,
     ) -> Dict[str, Any]:
-        logs: List[str] = []
+        logs = LogBuffer()
         try:
             os_type = executor.detect_os()
             logs.append(f"Detected OS: {os_type}")
 
-            if not isinstance(config, dict):
-                config = {}
-            os_cfg = config.get(os_type, {}) if isinstance(config.get(os_type), dict) else {}
+            config = config if isinstance(config, dict) else {}
+            os_cfg = config.get(os_type) or {}
 
             home = tomcat_home or os_cfg.get("tomcat_home") or config.get("tomcat_home")
             if not home:
                 return self._failure("Tomcat home directory not supplied", logs)
 
-            exec_timeout = self._resolve_timeout(os_cfg, config)
-            ready_timeout = self._resolve_ready_timeout(os_cfg, config)
-            port = self._resolve_port(os_cfg, config)
+            exec_timeout = self._resolve(os_cfg, config, "timeout", 120.0)
+            ready_timeout = self._resolve(os_cfg, config, "ready_timeout", 120.0)
+            port = self._resolve(os_cfg, config, "port", 8080, cast=int)
             logs.append(f"Command timeout set to {exec_timeout:.0f}s")
             logs.append(f"Readiness timeout set to {ready_timeout:.0f}s")
             logs.append(f"Target port: {port}")
 
-            if os_type == "windows":
-                return self._start_windows(
-                    executor,
-                    home,
-                    os_cfg,
-                    config,
-                    exec_timeout,
-                    ready_timeout,
-                    port,
-                    logs,
-                )
-            if os_type == "linux":
-                return self._start_linux(
-                    executor,
-                    home,
-                    os_cfg,
-                    config,
-                    exec_timeout,
-                    ready_timeout,
-                    port,
-                    logs,
-                )
-
-            logs.append("Unsupported operating system detected")
-            return self._failure("Unsupported operating system", logs)
+            if executor.probe_port(port):
+                logs.append(f"Port {port} is already listening; skipping start")
+                return {
+                    "name": self.name,
+                    "status": "Success",
+                    "command": "probe_port",
+                    "output": logs.getvalue(),
+                    "details": f"Tomcat already running and port {port} is listening",
+                    "tomcat_home": home,
+                }
+
+            handler = self._dispatch.get(os_type)
+            if handler is None:
+                logs.append("Unsupported operating system detected")
+                return self._failure("Unsupported operating system", logs)
+            return handler(
+                executor,
+                home,
+                os_cfg,
+                config,
+                exec_timeout,
+                ready_timeout,
+                port,
+                logs,
+            )
 
         except TimeoutError as exc:
             logs.append(str(exc))
@@ -98,70 +140,32 @@ class RemoteTomcatStartTool(RemoteTool):
         exec_timeout: float,
         ready_timeout: float,
         port: int,
-        logs: List[str],
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
         command_template = os_cfg.get("start_command") or cfg.get("start_command")
         if not command_template:
             # Escape backslashes for PowerShell
             ps_home = tomcat_home.replace("\\", "\\\\")
-            # Simple approach: use cmd.exe to run startup.bat in background
-            command = (
-                f"powershell -NoProfile -Command "
-                f"\"if (-not (Test-Path '{ps_home}')) {{ Write-Error 'Tomcat directory not found'; exit 1 }}; "
-                f"$bin = '{ps_home}\\bin'; "
-                f"$startup = Join-Path $bin 'startup.bat'; "
-                f"if (-not (Test-Path $startup)) {{ Write-Error 'startup.bat not found'; exit 1 }}; "
-                f"Start-Process -FilePath 'cmd.exe' -ArgumentList '/c', $startup -WorkingDirectory $bin -WindowStyle Hidden; "
-                f"Start-Sleep -Seconds 3; "
-                f"if (Get-Process -Name java -ErrorAction SilentlyContinue) {{ Write-Output 'Tomcat process started' }} else {{ Write-Warning 'Java process not detected yet' }}\""
+            # Start startup.bat in the background, then wait for the port in the same PowerShell process
+            script = self._WINDOWS_START_TMPL.format(
+                home=ps_home,
+                ready=self._ready_script_windows(port, ready_timeout),
             )
+            command = f"powershell -NoProfile -Command \"& {{ {script} }}\""
         else:
             command = command_template.format(tomcat_home=tomcat_home)
 
-        logs.append(f"Executing start command: {command}")
-        stdout, stderr = executor.run(command, timeout=exec_timeout)
-        if stdout.strip():
-            logs.append(stdout.strip())
-        if stderr.strip():
-            logs.append(f"stderr: {stderr.strip()}")
-
-        status = "Success" if not stderr.strip() else "Warning"
-        details = "Tomcat start command executed"
-        if status != "Success":
-            details = f"Tomcat start command completed with stderr: {stderr.strip()}"
-
-        ready_output, ready_error, ready_ok = self._wait_for_ready_windows(
+        return self._run_start(
             executor,
-            port,
+            command,
+            bool(command_template),
+            tomcat_home,
+            exec_timeout,
             ready_timeout,
+            port,
+            logs,
+            self._wait_for_ready_windows,
         )
-        if ready_output.strip():
-            logs.append(ready_output.strip())
-        if ready_error.strip():
-            logs.append(f"stderr: {ready_error.strip()}")
-
-        if not ready_ok:
-            return {
-                "name": self.name,
-                "status": "Failed",
-                "command": command,
-                "output": "\n".join(logs),
-                "details": f"Timed out waiting for Tomcat port {port}",
-                "tomcat_home": tomcat_home,
-            }
-
-        details = f"Tomcat started and port {port} is listening"
-        if status != "Warning":
-            status = "Success"
-
-        return {
-            "name": self.name,
-            "status": status,
-            "command": command,
-            "output": "\n".join(logs),
-            "details": details,
-            "tomcat_home": tomcat_home,
-        }
 
     # ------------------------------------------------------------------
     # Linux implementation
@@ -175,90 +179,115 @@ class RemoteTomcatStartTool(RemoteTool):
         exec_timeout: float,
         ready_timeout: float,
         port: int,
-        logs: List[str],
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
         command_template = os_cfg.get("start_command") or cfg.get("start_command")
         if not command_template:
             root = tomcat_home.rstrip("/")
             quoted_root = shlex.quote(root)
-            # Execute startup.sh and wait a bit to verify it started
-            script = (
-                f"if [ ! -d {quoted_root} ]; then "
-                f"echo 'Tomcat directory not found: {root}' >&2; exit 1; fi; "
-                f"cd {quoted_root}/bin && "
-                f"chmod +x startup.sh && "
-                f"nohup ./startup.sh >/dev/null 2>&1 & "
-                f"sleep 3; "
-                f"if pgrep -f 'catalina|tomcat' >/dev/null; then "
-                f"echo 'Tomcat process started'; else echo 'Warning: Tomcat process not detected yet' >&2; fi"
+            # Launch startup.sh, then wait for the port in the same remote shell
+            script = self._LINUX_START_TMPL.format(
+                quoted_root=quoted_root,
+                root=root,
+                ready=self._ready_script_linux(port, ready_timeout),
             )
             command = f"bash -lc {shlex.quote(script)}"
         else:
             command = command_template.format(tomcat_home=tomcat_home)
 
-        logs.append(f"Executing start command: {command}")
-        stdout, stderr = executor.run(command, timeout=exec_timeout)
-        if stdout.strip():
-            logs.append(stdout.strip())
-        if stderr.strip():
-            logs.append(f"stderr: {stderr.strip()}")
-
-        status = "Success" if not stderr.strip() else "Warning"
-        details = "Tomcat start command executed"
-        if status != "Success":
-            details = f"Tomcat start command completed with stderr: {stderr.strip()}"
-
-        ready_output, ready_error, ready_ok = self._wait_for_ready_linux(
+        return self._run_start(
             executor,
-            port,
+            command,
+            bool(command_template),
+            tomcat_home,
+            exec_timeout,
             ready_timeout,
+            port,
+            logs,
+            self._wait_for_ready_linux,
         )
-        if ready_output.strip():
+
+    def _run_start(
+        self,
+        executor: RemoteExecutor,
+        command: str,
+        custom_command: bool,
+        tomcat_home: str,
+        exec_timeout: float,
+        ready_timeout: float,
+        port: int,
+        logs: LogBuffer,
+        wait_for_ready: Callable[[RemoteExecutor, int, float], tuple[str, str, bool]],
+    ) -> Dict[str, Any]:
+        logs.append(f"Executing start command: {command}")
+        if custom_command:
+            # User-supplied commands are opaque, so wait for the port separately
+            _, err_lines = logs.extend_stream(executor.run_stream(command, timeout=exec_timeout))
+            ready_output, ready_error, ready_ok = wait_for_ready(executor, port, ready_timeout)
             logs.append(ready_output.strip())
-        if ready_error.strip():
-            logs.append(f"stderr: {ready_error.strip()}")
+            if ready_error.strip():
+                logs.append(f"stderr: {ready_error.strip()}")
+        else:
+            out_lines, err_lines = logs.extend_stream(
+                executor.run_stream(command, timeout=exec_timeout + ready_timeout)
+            )
+            ready_ok = f"Port {port} is listening." in out_lines
 
         if not ready_ok:
             return {
                 "name": self.name,
                 "status": "Failed",
                 "command": command,
-                "output": "\n".join(logs),
+                "output": logs.getvalue(),
                 "details": f"Timed out waiting for Tomcat port {port}",
                 "tomcat_home": tomcat_home,
             }
 
-        details = f"Tomcat started and port {port} is listening"
-        if status != "Warning":
-            status = "Success"
-
         return {
             "name": self.name,
-            "status": status,
+            "status": "Warning" if err_lines else "Success",
             "command": command,
-            "output": "\n".join(logs),
-            "details": details,
+            "output": logs.getvalue(),
+            "details": f"Tomcat started and port {port} is listening",
             "tomcat_home": tomcat_home,
         }
 
+    def _ready_script_windows(self, port: int, timeout: float) -> str:
+        return self._WINDOWS_READY_TMPL.format(port=port, timeout=int(timeout))
+
+    def _ready_script_linux(self, port: int, timeout: float) -> str:
+        return self._LINUX_READY_TMPL.format(port=port, timeout=int(timeout))
+
+    def _wait_for_port(
+        self,
+        executor: RemoteExecutor,
+        port: int,
+        timeout: float,
+    ) -> Optional[tuple[str, str, bool]]:
+        """Poll the port through SSH port-forwarding; None if the server disallows it."""
+        deadline = time.monotonic() + timeout
+        while True:
+            listening = executor.probe_port(port)
+            if listening is None:
+                return None
+            if listening:
+                return f"Port {port} is listening.", "", True
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return "", f"Tomcat port {port} not listening after {int(timeout)}s", False
+            time.sleep(min(0.25, remaining))
+
     def _wait_for_ready_windows(
         self,
         executor: RemoteExecutor,
         port: int,
         timeout: float,
     ) -> tuple[str, str, bool]:
-        script = (
-            f"$port = {port};"
-            f"$deadline = (Get-Date).AddSeconds({int(timeout)});"
-            "while ((Get-Date) -lt $deadline) {"
-            "  $listeners = [System.Net.NetworkInformation.IPGlobalProperties]::GetIPGlobalProperties().GetActiveTcpListeners();"
-            "  if ($listeners | Where-Object { $_.Port -eq $port }) {"
-            "    Write-Output \"Port $port is listening.\"; exit 0"
-            "  }"
-            "  Start-Sleep -Milliseconds 500"
-            "}"
-            f"Write-Error \"Tomcat port {port} not listening after {int(timeout)}s\"; exit 1"
-        )
+        probed = self._wait_for_port(executor, port, timeout)
+        if probed is not None:
+            return probed
+
+        script = self._ready_script_windows(port, timeout)
         command = f"powershell -NoProfile -Command \"& {{ {script} }}\""
 
         try:
@@ -274,16 +303,11 @@ class RemoteTomcatStartTool(RemoteTool):
         port: int,
         timeout: float,
     ) -> tuple[str, str, bool]:
-        script = (
-            f"end=$((SECONDS+{int(timeout)}));"
-            "while [ $SECONDS -lt $end ]; do "
-            f"if ss -ltn '( sport = :{port} )' 2>/dev/null | grep -q {port}; then "
-            f"echo 'Port {port} is listening.'; exit 0; fi; "
-            "sleep 0.5;"
-            "done;"
-            f"echo 'Tomcat port {port} not listening after {int(timeout)}s' 1>&2; exit 1"
-        )
-        command = f"bash -lc {shlex.quote(script)}"
+        probed = self._wait_for_port(executor, port, timeout)
+        if probed is not None:
+            return probed
+
+        command = f"bash -lc {shlex.quote(self._ready_script_linux(port, timeout))}"
 
         try:
             stdout, stderr = executor.run(command, timeout=timeout + 5)
@@ -292,43 +316,28 @@ class RemoteTomcatStartTool(RemoteTool):
         except TimeoutError as exc:
             return "", str(exc), False
 
-    def _resolve_timeout(self, os_cfg: Dict[str, Any], cfg: Dict[str, Any]) -> float:
-        candidates = [
-            os_cfg.get("timeout") if isinstance(os_cfg, dict) else None,
-            cfg.get("timeout") if isinstance(cfg, dict) else None,
-        ]
-        for value in candidates:
-            if isinstance(value, (int, float)) and value > 0:
-                return float(value)
-        return 120.0
-
-    def _resolve_ready_timeout(self, os_cfg: Dict[str, Any], cfg: Dict[str, Any]) -> float:
-        candidates = [
-            os_cfg.get("ready_timeout") if isinstance(os_cfg, dict) else None,
-            cfg.get("ready_timeout") if isinstance(cfg, dict) else None,
-        ]
-        for value in candidates:
+    def _resolve(
+        self,
+        os_cfg: Dict[str, Any],
+        cfg: Dict[str, Any],
+        key: str,
+        default: Any,
+        *,
+        cast: Callable[[Any], Any] = float,
+    ) -> Any:
+        """Return the first positive ``key`` value from the OS section, then the shared config."""
+        for value in (os_cfg.get(key), cfg.get(key)):
             if isinstance(value, (int, float)) and value > 0:
-                return float(value)
-        return 120.0
-
-    def _resolve_port(self, os_cfg: Dict[str, Any], cfg: Dict[str, Any]) -> int:
-        candidates = [
-            os_cfg.get("port") if isinstance(os_cfg, dict) else None,
-            cfg.get("port") if isinstance(cfg, dict) else None,
-        ]
-        for value in candidates:
-            if isinstance(value, int) and value > 0:
-                return value
-            if isinstance(value, str) and value.isdigit():
-                return int(value)
-        return 8080
-
-    def _failure(self, message: str, logs: List[str]) -> Dict[str, Any]:
+                return cast(value)
+            if isinstance(value, str) and value.isdigit() and int(value) > 0:
+                return cast(value)
+        return default
+
+    def _failure(self, message: str, logs: LogBuffer) -> Dict[str, Any]:
         return {
             "name": self.name,
             "status": "Failed",
             "command": "remote_tomcat_start",
-            "output": "\n".join(logs),
+            "output": logs.getvalue(),
             "details": message,
         }
@@ -2,16 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
 from Remote.remote_executor import RemoteExecutor
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 
 
 class RemoteTomcatStopTool(RemoteTool):
     """Stop Apache Tomcat on a remote host."""
 
     config_path = ("post_install", "tomcat_stop")
+    __slots__ = ()
 
     def __init__(self) -> None:
         super().__init__(
@@ -32,12 +33,13 @@ class RemoteTomcatStopTool(RemoteTool):
         config: Dict[str, Any],
         tomcat_home: str | None = None,
     ) -> Dict[str, Any]:
-        logs: List[str] = []
+        logs = LogBuffer()
         try:
             os_type = executor.detect_os()
             logs.append(f"Detected OS: {os_type}")
 
-            os_cfg = config.get(os_type, {}) if isinstance(config, dict) else {}
+            config = config if isinstance(config, dict) else {}
+            os_cfg = config.get(os_type) or {}
             tomcat_home = tomcat_home or os_cfg.get("tomcat_home") or config.get("tomcat_home")
             if not tomcat_home:
                 return self._failure("Tomcat home directory not supplied", logs)
@@ -46,25 +48,36 @@ class RemoteTomcatStopTool(RemoteTool):
             if not command_template:
                 return self._failure("stop_command not configured", logs)
 
+            # Only trust the probe for an explicitly configured port, and only a definite refusal
+            # (False, not None) skips the stop; the stop command itself is safe to repeat
+            port = os_cfg.get("port") or config.get("port")
+            if port and executor.probe_port(int(port)) is False:
+                logs.append(f"Port {port} is not listening; skipping stop")
+                return {
+                    "name": self.name,
+                    "status": "Success",
+                    "command": "probe_port",
+                    "output": logs.getvalue(),
+                    "details": "Tomcat already stopped",
+                    "tomcat_home": tomcat_home,
+                }
+
             command = command_template.format(tomcat_home=tomcat_home)
             logs.append(f"Executing stop command: {command}")
 
-            stdout, stderr = executor.run(command)
-            if stdout.strip():
-                logs.append(stdout.strip())
-            if stderr.strip():
-                logs.append(f"stderr: {stderr.strip()}")
+            _, err_lines = logs.extend_stream(executor.run_stream(command))
+            err = "\n".join(err_lines)
 
-            status = "Success" if not stderr.strip() else "Warning"
+            status = "Success" if not err else "Warning"
             details = "Tomcat stop command executed"
-            if status != "Success":
-                details = f"Tomcat stop command completed with stderr: {stderr.strip()}"
+            if err:
+                details = f"Tomcat stop command completed with stderr: {err}"
 
             return {
                 "name": self.name,
                 "status": status,
                 "command": command,
-                "output": "\n".join(logs),
+                "output": logs.getvalue(),
                 "details": details,
                 "tomcat_home": tomcat_home,
             }
@@ -73,11 +86,11 @@ class RemoteTomcatStopTool(RemoteTool):
             logs.append(f"Exception: {exc}")
             return self._failure(str(exc), logs)
 
-    def _failure(self, message: str, logs: List[str]) -> Dict[str, Any]:
+    def _failure(self, message: str, logs: LogBuffer) -> Dict[str, Any]:
         return {
             "name": self.name,
             "status": "Failed",
             "command": "remote_tomcat_stop",
-            "output": "\n".join(logs),
+            "output": logs.getvalue(),
             "details": message,
         }
@@ -2,19 +2,33 @@
 
 from __future__ import annotations
 
+import atexit
+import random
+import threading
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Optional, Tuple
 
 import requests
+from requests.adapters import HTTPAdapter
 
 from Remote.remote_executor import RemoteExecutor
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
+
+INITIAL_POLL_DELAY = 0.1
+MAX_POLL_DELAY = 2.0
+# (connect, read) timeouts for a single probe
+PROBE_TIMEOUT = (1, 3)
 
 
 class RemoteTomcatValidationTool(RemoteTool):
     """Verify that a remote Tomcat instance responds over HTTP."""
 
     config_path = ("post_install", "tomcat_validation")
+    __slots__ = ()
+
+    # Shared across instances and calls so keep-alive connections survive between probes
+    _session: Optional[requests.Session] = None
+    _session_lock = threading.Lock()
 
     def __init__(self) -> None:
         super().__init__(
@@ -49,7 +63,7 @@ class RemoteTomcatValidationTool(RemoteTool):
         tomcat_home: str | None = None,
     ) -> Dict[str, Any]:
         del executor  # Validation uses only network checks against HTTP endpoint
-        logs: List[str] = []
+        logs = LogBuffer()
         try:
             wait_seconds = int(config.get("wait_seconds", 30))
             host_template = config.get("host_template", "{host}")
@@ -60,20 +74,9 @@ class RemoteTomcatValidationTool(RemoteTool):
 
             logs.append(f"Waiting up to {wait_seconds}s for HTTP {url}")
             deadline = time.time() + max(wait_seconds, 1)
-            last_error: Optional[str] = None
-            status_code: Optional[int] = None
-
-            while time.time() < deadline:
-                try:
-                    response = requests.get(url, timeout=3)
-                    status_code = response.status_code
-                    if response.ok:
-                        logs.append(f"Received HTTP {response.status_code}")
-                        break
-                    last_error = f"HTTP {response.status_code} {response.reason}"
-                except requests.RequestException as exc:
-                    last_error = str(exc)
-                time.sleep(2)
+            status_code, last_error, responded = self._probe(url, deadline)
+            if responded:
+                logs.append(f"Received HTTP {status_code}")
             else:
                 logs.append("Timed out waiting for HTTP response")
 
@@ -89,7 +92,7 @@ class RemoteTomcatValidationTool(RemoteTool):
                 "name": self.name,
                 "status": result_status,
                 "command": f"Validate Tomcat at {url}",
-                "output": "\n".join(filter(None, logs)),
+                "output": logs.getvalue(),
                 "details": details,
                 "url": url,
                 "status_code": status_code,
@@ -102,11 +105,65 @@ class RemoteTomcatValidationTool(RemoteTool):
             logs.append(f"Exception: {exc}")
             return self._failure(str(exc), logs)
 
-    def _failure(self, message: str, logs: List[str]) -> Dict[str, Any]:
+    def _probe(self, url: str, deadline: float) -> Tuple[Optional[int], Optional[str], bool]:
+        """Poll ``url`` until it answers 2xx/3xx or ``deadline`` passes.
+
+        Returns ``(status_code, last_error, responded)``.
+        """
+        session = self._get_session()
+        last_error: Optional[str] = None
+        status_code: Optional[int] = None
+        # HEAD avoids transferring the page body
+        method = "HEAD"
+        attempt = 0
+        while time.time() < deadline:
+            try:
+                response = session.request(method, url, timeout=PROBE_TIMEOUT)
+                status_code = response.status_code
+                if response.ok:
+                    return status_code, None, True
+                if method == "HEAD" and status_code in (405, 501):
+                    method = "GET"
+                    continue
+                last_error = f"HTTP {response.status_code} {response.reason}"
+            except requests.RequestException as exc:
+                last_error = str(exc)
+            # Jittered exponential backoff: react quickly once Tomcat comes up
+            delay = min(MAX_POLL_DELAY, INITIAL_POLL_DELAY * 2 ** attempt)
+            attempt += 1
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            time.sleep(min(remaining, delay * random.uniform(0.5, 1.0)))
+        return status_code, last_error, False
+
+    @classmethod
+    def _get_session(cls) -> requests.Session:
+        if cls._session is None:
+            with cls._session_lock:
+                if cls._session is None:
+                    session = requests.Session()
+                    # Retries are handled by the polling loop
+                    adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=0)
+                    session.mount("http://", adapter)
+                    session.mount("https://", adapter)
+                    cls._session = session
+                    atexit.register(cls.close_session)
+        return cls._session
+
+    @classmethod
+    def close_session(cls) -> None:
+        """Release the pooled keep-alive connections (also runs at interpreter exit)."""
+        with cls._session_lock:
+            session, cls._session = cls._session, None
+        if session is not None:
+            session.close()
+
+    def _failure(self, message: str, logs: LogBuffer) -> Dict[str, Any]:
         return {
             "name": self.name,
             "status": "Failed",
             "command": "remote_tomcat_validation",
-            "output": "\n".join(filter(None, logs)),
+            "output": logs.getvalue(),
             "details": message,
         }
@@ -1,11 +1,19 @@
-from .remote_disk_check import RemoteDiskCheckTool
-from .remote_port_check import RemotePortCheckTool
-from .remote_ram_check import RemoteRamCheckTool
-from .remote_java_install import RemoteJavaInstallTool
-
-__all__ = [
-	"RemoteDiskCheckTool",
-	"RemotePortCheckTool",
-	"RemoteRamCheckTool",
-	"RemoteJavaInstallTool",
-]
+import importlib
+
+# Exported name -> defining submodule; loaded on first access so importing one tool
+# (e.g. the disk check) does not pull in the Java installer and its HTTP client
+_EXPORTS = {
+	"RemoteDiskCheckTool": ".remote_disk_check",
+	"RemotePortCheckTool": ".remote_port_check",
+	"RemoteRamCheckTool": ".remote_ram_check",
+	"RemoteJavaInstallTool": ".remote_java_install",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+	module = _EXPORTS.get(name)
+	if module is None:
+		raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+	return getattr(importlib.import_module(module, __name__), name)
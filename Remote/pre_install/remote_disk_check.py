@@ -1,14 +1,34 @@
+import re
 import shlex
 from typing import Any, Dict, Optional
 
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 from Remote.remote_executor import RemoteExecutor
 
+# Matches both the legacy ("Total # of free bytes : 123") and newer
+# ("Total free bytes : 1,234 (1.1 KB)") fsutil layouts; quota lines are skipped.
+_FSUTIL_RE = re.compile(r"^\s*Total (?:# of )?(free )?bytes\s*:\s*([\d,]+)", re.I | re.M)
+_KV_RE = re.compile(r"(TOTAL|FREE)=(\d+(?:\.\d+)?)")
+
 
 class RemoteDiskCheckTool(RemoteTool):
     """Check available disk space on a remote Windows or Linux host."""
 
     config_path = ("pre_install", "disk_check")
+    __slots__ = ("_dispatch",)
+
+    _FSUTIL_TMPL = 'cmd /c "fsutil volume diskfree {drive}"'
+    _WINDOWS_TMPL = (
+        "powershell -NoProfile -Command \""
+        "$disk = Get-CimInstance Win32_LogicalDisk -Filter \\\"DeviceID='{drive}'\\\";"
+        "if ($disk) {{"
+        "  $totalMB = [math]::Round($disk.Size/1MB,2);"
+        "  $freeMB = [math]::Round($disk.FreeSpace/1MB,2);"
+        "  Write-Output (\\\"TOTAL=$totalMB;FREE=$freeMB\\\");"
+        "}} else {{ Write-Output 'ERROR:DiskNotFound'; }}\""
+    )
+    # Exact byte counts with only the numeric columns (GNU df rejects -P together with --output)
+    _LINUX_TMPL = "bash -lc \"df -B1 --output=size,used,avail {path} | tail -1\""
 
     def __init__(self) -> None:
         super().__init__(
@@ -26,6 +46,7 @@ class RemoteDiskCheckTool(RemoteTool):
                 },
             },
         )
+        self._dispatch = {"windows": self._check_windows, "linux": self._check_linux}
 
     def run(
         self,
@@ -34,7 +55,7 @@ class RemoteDiskCheckTool(RemoteTool):
         path: Optional[str] = None,
         min_free_mb: Optional[int] = None,
     ) -> Dict[str, Any]:
-        logs = []
+        logs = LogBuffer()
         try:
             os_type = executor.detect_os()
             logs.append(f"Detected OS: {os_type}")
@@ -47,14 +68,12 @@ class RemoteDiskCheckTool(RemoteTool):
             threshold = min_free_mb if min_free_mb is not None else os_cfg.get("min_free_mb", 2048)
             threshold = int(threshold)
 
-            if os_type == "windows":
-                result = self._check_windows(executor, target_path, threshold, logs)
-            elif os_type == "linux":
-                result = self._check_linux(executor, target_path, threshold, logs)
-            else:
+            handler = self._dispatch.get(os_type)
+            if handler is None:
                 return self._failure("Unsupported operating system", logs)
+            result = handler(executor, target_path, threshold, logs)
 
-            result.setdefault("output", "\n".join(logs))
+            result.setdefault("output", logs.getvalue())
             return result
 
         except Exception as exc:  # pragma: no cover - defensive handling for remote execution
@@ -66,29 +85,29 @@ class RemoteDiskCheckTool(RemoteTool):
         executor: RemoteExecutor,
         target_path: str,
         threshold: int,
-        logs: Any,
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
         drive_letter = self._extract_drive(target_path)
         logs.append(f"Inspecting drive {drive_letter} on Windows host")
-        command = (
-            "powershell -NoProfile -Command \""
-            f"$disk = Get-CimInstance Win32_LogicalDisk -Filter \\\"DeviceID='{drive_letter}'\\\";"
-            "if ($disk) {"
-            "  $totalMB = [math]::Round($disk.Size/1MB,2);"
-            "  $freeMB = [math]::Round($disk.FreeSpace/1MB,2);"
-            "  Write-Output (\\\"TOTAL=$totalMB;FREE=$freeMB\\\");"
-            "} else { Write-Output 'ERROR:DiskNotFound'; }\""
-        )
+        command = self._FSUTIL_TMPL.format(drive=drive_letter)
         stdout, stderr = executor.run(command)
-        payload = (stdout + stderr).strip()
-        logs.append(payload)
-
-        if "ERROR" in payload.upper():
-            return self._failure("Unable to retrieve disk details", logs)
-
-        metrics = self._parse_metrics(payload)
-        if not metrics:
-            return self._failure("Unrecognized disk output", logs)
+        metrics = self._parse_fsutil(stdout)
+        if metrics is None:
+            # fsutil may be missing, localized, or restricted to administrators
+            logs.append(f"fsutil unavailable, falling back to PowerShell: {(stdout + stderr).strip()}")
+            command = self._WINDOWS_TMPL.format(drive=drive_letter)
+            stdout, stderr = executor.run(command, combine_stderr=True)
+            payload = (stdout + stderr).strip()
+            logs.append(payload)
+
+            if "ERROR" in payload.upper():
+                return self._failure("Unable to retrieve disk details", logs)
+
+            metrics = self._parse_metrics(payload)
+            if not metrics:
+                return self._failure("Unrecognized disk output", logs)
+        else:
+            logs.append(stdout.strip())
 
         status = "Success" if metrics["free_mb"] >= threshold else "Failed"
         details = (
@@ -110,24 +129,25 @@ class RemoteDiskCheckTool(RemoteTool):
         executor: RemoteExecutor,
         target_path: str,
         threshold: int,
-        logs: Any,
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
         logs.append(f"Inspecting path {target_path} on Linux host")
-        quoted = shlex.quote(target_path)
-        command = f"bash -lc \"df -Pm {quoted} | tail -1\""
+        command = self._LINUX_TMPL.format(path=shlex.quote(target_path))
         stdout, stderr = executor.run(command)
-        logs.extend(filter(None, [stdout.strip(), stderr.strip()]))
+        logs.append(stdout.strip())
+        logs.append(stderr.strip())
         line = stdout.strip().splitlines()
         if not line:
             return self._failure("No output from df command", logs)
 
-        parts = line[-1].split()
-        if len(parts) < 4:
+        try:
+            total_b, used_b, avail_b = map(int, line[-1].split())
+        except ValueError:
             return self._failure("Unexpected df output", logs)
 
-        total_mb = float(parts[1])
-        used_mb = float(parts[2])
-        free_mb = float(parts[3])
+        total_mb = total_b >> 20
+        used_mb = used_b >> 20
+        free_mb = avail_b >> 20
 
         status = "Success" if free_mb >= threshold else "Failed"
         details = (
@@ -154,28 +174,29 @@ class RemoteDiskCheckTool(RemoteTool):
             return f"{candidate[0].upper()}:"
         return "C:"
 
+    def _parse_fsutil(self, payload: str) -> Optional[Dict[str, float]]:
+        values = {}
+        for free, number in _FSUTIL_RE.findall(payload):
+            values.setdefault("free" if free else "total", int(number.replace(",", "")))
+        if "total" not in values or "free" not in values:
+            return None
+        total_mb = round(values["total"] / 1048576, 2)
+        free_mb = round(values["free"] / 1048576, 2)
+        return {"total_mb": total_mb, "free_mb": free_mb, "used_mb": round(total_mb - free_mb, 2)}
+
     def _parse_metrics(self, payload: str) -> Optional[Dict[str, float]]:
-        parts = payload.replace("\r", "").split(";")
-        metrics: Dict[str, float] = {}
-        for part in parts:
-            if "=" not in part:
-                continue
-            key, value = part.split("=", 1)
-            try:
-                metrics[f"{key.lower()}_mb"] = float(value)
-            except ValueError:
-                continue
+        metrics = {f"{key.lower()}_mb": float(value) for key, value in _KV_RE.findall(payload)}
         if "total_mb" in metrics and "free_mb" in metrics:
             used = metrics["total_mb"] - metrics["free_mb"]
             metrics.setdefault("used_mb", used)
             return metrics
         return None
 
-    def _failure(self, message: str, logs: Any) -> Dict[str, Any]:
+    def _failure(self, message: str, logs: LogBuffer) -> Dict[str, Any]:
         return {
             "name": self.name,
             "status": "Failed",
             "command": self.name,
             "details": message,
-            "output": "\n".join(str(item) for item in logs),
+            "output": logs.getvalue(),
         }
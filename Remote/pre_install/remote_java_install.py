@@ -1,21 +1,62 @@
-from typing import Dict, Any
+import base64
+import json
+import shlex
+from typing import Any, Callable, Dict, Sequence
+from urllib.parse import urlsplit
 
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 from Remote.remote_executor import RemoteExecutor
 
 try:  # Prefer package-relative imports when available
     from ..utilities.remote_download import RemoteCurlDownloadTool
     from ..utilities.remote_extract import RemoteZipExtractTool
-    from ..utilities.remote_download import _to_ps_literal
+    from ..utilities.remote_download import _linux_fetch_command, _to_ps_literal
 except ImportError:  # Fallback for script executions where pre_install is top-level
     from utilities.remote_download import RemoteCurlDownloadTool
     from utilities.remote_extract import RemoteZipExtractTool
-    from utilities.remote_download import _to_ps_literal
+    from utilities.remote_download import _linux_fetch_command, _to_ps_literal
 
 
 class RemoteJavaInstallTool(RemoteTool):
 
     config_path = ("pre_install", "java")
+    __slots__ = ("_download_tool", "_extract_tool")
+
+    # One PowerShell start answers "is Java usable": java.exe on PATH, else JAVA_HOME\bin
+    # from an earlier run whose PATH change this session has not picked up yet
+    _WINDOWS_JAVA_PROBE = (
+        "powershell -NoProfile -Command \""
+        "$ErrorActionPreference = 'SilentlyContinue';"
+        "$java = (Get-Command java.exe).Source;"
+        "if (-not $java -and $env:JAVA_HOME) {"
+        "  $candidate = Join-Path $env:JAVA_HOME 'bin\\java.exe';"
+        "  if (Test-Path $candidate) { $java = $candidate }"
+        "};"
+        "$version = '';"
+        "if ($java) { $version = (& $java -version 2>&1 | ForEach-Object { $_.ToString() }) -join [char]10 };"
+        "ConvertTo-Json -Compress @{ Version = $version; JavaHome = $env:JAVA_HOME; Java = $java }\""
+    )
+    # New-Item -Force is idempotent for directories, so no Test-Path first
+    _ENSURE_DIRS_TMPL = (
+        "@({literals}) | ForEach-Object {{ New-Item -ItemType Directory -Force -Path $_ | Out-Null }}"
+    )
+    # JAVA_HOME and PATH in one PowerShell start; sent via -EncodedCommand to avoid nested quoting
+    _ENV_SCRIPT_TMPL = "\n".join(
+        [
+            "$ProgressPreference = 'SilentlyContinue'",
+            "$javaHome = {java_home}",
+            "[Environment]::SetEnvironmentVariable('JAVA_HOME', $javaHome, '{scope}')",
+            "$bin = Join-Path $javaHome 'bin'",
+            "$old = [Environment]::GetEnvironmentVariable('PATH', '{scope}')",
+            # Whole-entry, case-insensitive match; a substring test also hits longer entries
+            "$parts = [System.Collections.Generic.HashSet[string]]::new("
+            "[string[]]($old -split ';'), [System.StringComparer]::OrdinalIgnoreCase)",
+            "if ($parts.Add($bin)) {{",
+            "    [Environment]::SetEnvironmentVariable('PATH', $bin + ';' + $old, '{scope}')",
+            "}}",
+        ]
+    )
+    _VERSION_TMPL = "powershell -Command \"& (Join-Path ({java_home}) 'bin\\java.exe') -version\""
 
     def __init__(self) -> None:
         super().__init__(
@@ -28,7 +69,7 @@ class RemoteJavaInstallTool(RemoteTool):
         self._extract_tool = RemoteZipExtractTool()
 
     def run(self, executor: RemoteExecutor, config: Dict[str, Any]) -> Dict[str, Any]:
-        logs = []
+        logs = LogBuffer()
 
         try:
             logs.append("Detecting remote operating system...")
@@ -36,7 +77,7 @@ class RemoteJavaInstallTool(RemoteTool):
             logs.append(f"✔ Detected OS: {os_type}")
 
             # ============================================================
-            #  LINUX PATH (unchanged)
+            #  LINUX PATH (packages, then one run_script: fetch, extract, verify)
             # ============================================================
 
             if os_type == "linux":
@@ -51,29 +92,66 @@ class RemoteJavaInstallTool(RemoteTool):
                     return self._missing_config("linux.download_url", logs)
 
                 logs.append("Checking existing Java...")
-                out, err = executor.run("java -version")
-                if "version" in (out + err).lower():
+                version = self._probe_java(executor, "java -version", self._linux_java_version)
+                if version:
                     logs.append("✔ Java already installed.")
-                    return {"name": self.name, "status": "Success", "command": "java -version", "output": out + err, "details": "\n".join(logs)}
+                    return {"name": self.name, "status": "Success", "command": "java -version", "output": version, "details": logs.getvalue()}
 
                 logs.append("Installing Java on Linux...")
                 if packages:
                     pkg_cmd = linux_cfg.get("package_install_command", "sudo apt install -y {packages}")
                     pkg_list = " ".join(packages)
-                    executor.run(linux_cfg.get("package_update_command", "sudo apt update -y"))
-                    executor.run(pkg_cmd.format(packages=pkg_list))
-
-                executor.run(f"wget -O {archive_path} {download_url}")
-                executor.run(f"mkdir -p {install_dir}")
-                executor.run(f"tar -xvf {archive_path} -C {install_dir}")
-                out, err = executor.run(version_check)
+                    # Install even when the index refresh fails, as the separate calls did
+                    update_cmd = linux_cfg.get("package_update_command", "sudo apt update -y")
+                    script = f"{update_cmd}; {pkg_cmd.format(packages=pkg_list)}"
+                    executor.run(f"bash -lc {shlex.quote(script)}")
+
+                # Each step needs the previous one (wget comes from the package step), so
+                # chain them in one remote shell instead of a round-trip per step
+                steps = [f"mkdir -p {install_dir}"]
+                # Only a configured name says what the archive is; the jdk.tar.gz default does not
+                gzipped = any(
+                    name.endswith((".tar.gz", ".tgz"))
+                    for name in (urlsplit(download_url).path, linux_cfg.get("archive_path", ""))
+                )
+                tar_cmd = "tar -xf"
+                if gzipped:
+                    tar_cmd = "tar -xzf"
+                    if linux_cfg.get("parallel_decompress", True):
+                        # pigz inflates on a separate thread from tar's reads/writes; plain gzip otherwise
+                        tar_cmd = 'tar --use-compress-program="$(command -v pigz || command -v gzip)" -xf'
+                # Checksum reuse needs the archive on disk, and tar only sniffs the compression
+                # of a file, not a pipe; otherwise stream the download into tar
+                if gzipped and linux_cfg.get("stream_extract", True) and not linux_cfg.get("expected_sha256"):
+                    fetch = (
+                        f"if command -v curl >/dev/null 2>&1; then curl -fsSL {download_url}; "
+                        f"else wget -qO- {download_url}; fi"
+                    )
+                    steps.append(f"( set -o pipefail; {{ {fetch}; }} | {tar_cmd} - -C {install_dir} )")
+                else:
+                    steps.append(
+                        _linux_fetch_command(
+                            download_url,
+                            archive_path,
+                            linux_cfg.get("expected_sha256"),
+                            int(linux_cfg.get("download_connections", 1)),
+                        )
+                    )
+                    # No -v: listing thousands of JDK files only adds SSH traffic
+                    steps.append(f"{tar_cmd} {archive_path} -C {install_dir}")
+                # The version check rides in the same invocation, right after the install steps
+                results = executor.run_script([*steps, version_check])
+                output, status = results[-1] if results else ("", -1)
+                installed = len(results) > len(steps)
+                if not installed:
+                    logs.append(f"Install step {len(results)} of {len(steps)} failed (exit {status})")
 
                 return {
                     "name": self.name,
-                    "status": "Success" if "version" in (out + err).lower() else "Failed",
+                    "status": "Success" if installed and "version" in output.lower() else "Failed",
                     "command": "java -version",
-                    "output": out + err,
-                    "details": "\n".join(logs),
+                    "output": output,
+                    "details": logs.getvalue(),
                 }
 
             # ============================================================
@@ -93,18 +171,17 @@ class RemoteJavaInstallTool(RemoteTool):
                     return self._missing_config("windows.(download_url/archive_path/install_root)", logs)
 
                 logs.append("Checking existing Java...")
-                out, err = executor.run('powershell -Command "java -version"')
-                if "version" in (out + err).lower():
+                version = self._probe_java(executor, self._WINDOWS_JAVA_PROBE, self._windows_java_version)
+                if version:
                     logs.append("✔ Java already installed.")
-                    return {"name": self.name, "status": "Success", "command": "java -version", "output": out + err, "details": "\n".join(logs)}
+                    return {"name": self.name, "status": "Success", "command": "java -version", "output": version, "details": logs.getvalue()}
 
                 logs.append("Java not found → Installing Java...")
 
                 # Create folders
                 logs.append("Ensuring folders exist...")
                 archive_dir = win_cfg.get("archive_dir") or archive_path.rsplit("\\", 1)[0]
-                self._ensure_directory(executor, archive_dir)
-                self._ensure_directory(executor, install_root)
+                executor.run_batch([self._ensure_directories([archive_dir, install_root])], os_type)
 
                 # -----------------------------
                 # CURL DOWNLOAD (works!)
@@ -116,19 +193,24 @@ class RemoteJavaInstallTool(RemoteTool):
                     destination=archive_path,
                     min_size=min_size,
                     extra_args=win_cfg.get("curl_extra_args"),
+                    expected_sha256=win_cfg.get("expected_sha256"),
+                    download_cache=win_cfg.get("download_cache") or None,
                 )
                 download_details = download_result.get("details", "")
                 if download_details:
-                    logs.extend(download_details.splitlines())
+                    logs.append(download_details)
 
                 if download_result.get("status") != "Success":
-                    download_result["details"] = "\n".join(logs)
+                    download_result["details"] = logs.getvalue()
                     download_result["name"] = self.name
                     download_result.setdefault("command", "curl.exe")
                     download_result.setdefault("output", "")
                     return download_result
 
-                logs.append("✔ JDK download successful.")
+                if download_result.get("metadata", {}).get("cached"):
+                    logs.append("✔ Archive reused from previous run.")
+                else:
+                    logs.append("✔ JDK download successful.")
 
                 # -----------------------------
                 # Extract ZIP
@@ -142,11 +224,11 @@ class RemoteJavaInstallTool(RemoteTool):
                 )
                 extract_details = extract_result.get("details", "")
                 if extract_details:
-                    logs.extend(extract_details.splitlines())
+                    logs.append(extract_details)
 
                 jdk_folder = extract_result.get("metadata", {}).get("folder_name", "")
                 if extract_result.get("status") != "Success" or not jdk_folder:
-                    extract_result["details"] = "\n".join(logs)
+                    extract_result["details"] = logs.getvalue()
                     extract_result["name"] = self.name
                     extract_result.setdefault("command", "Expand-Archive")
                     extract_result.setdefault("output", "")
@@ -168,26 +250,8 @@ class RemoteJavaInstallTool(RemoteTool):
                 if env_scopes:
                     logs.append("Setting JAVA_HOME and PATH...")
                     env_scope = win_cfg.get("environment_scope", "User")
-                    set_env_cmd = (
-                        "powershell -Command \""
-                        f"$javaHome = {java_home_expr};"
-                        f"[Environment]::SetEnvironmentVariable('JAVA_HOME', $javaHome, '{env_scope}')"
-                        "\""
-                    )
-                    _, err = executor.run(set_env_cmd)
-                    if err.strip():
-                        logs.append(err.strip())
-
-                    path_cmd = (
-                        "powershell -Command \""
-                        f"$bin = Join-Path ({java_home_expr}) 'bin';"
-                        f"$old=[Environment]::GetEnvironmentVariable('PATH','{env_scope}');"
-                        "if ($old -notlike '*'+$bin+'*') {"
-                        f"    [Environment]::SetEnvironmentVariable('PATH',$bin+';'+$old,'{env_scope}');"
-                        "}"
-                        "\""
-                    )
-                    _, err = executor.run(path_cmd)
+                    env_script = self._ENV_SCRIPT_TMPL.format(java_home=java_home_expr, scope=env_scope)
+                    _, err = executor.run(self._encoded_powershell(env_script))
                     if err.strip():
                         logs.append(err.strip())
 
@@ -195,7 +259,7 @@ class RemoteJavaInstallTool(RemoteTool):
                 # Test Java
                 # -----------------------------
                 logs.append("Testing Java installation...")
-                default_version_cmd = f"powershell -Command \"& (Join-Path ({java_home_expr}) 'bin\\java.exe') -version\""
+                default_version_cmd = self._VERSION_TMPL.format(java_home=java_home_expr)
                 version_command = win_cfg.get("version_command", default_version_cmd)
                 version_command = version_command.format(folder=jdk_folder)
                 out, err = executor.run(version_command)
@@ -206,33 +270,56 @@ class RemoteJavaInstallTool(RemoteTool):
                     "status": "Success" if "version" in (out + err).lower() else "Failed",
                     "command": "java -version",
                     "output": out + err,
-                    "details": "\n".join(logs)
+                    "details": logs.getvalue()
                 }
 
             return {"name": self.name, "status": "Failed", "details": "Unknown OS"}
 
         except Exception as e:
             logs.append("Exception: " + str(e))
-            return {"name": self.name, "status": "Failed", "details": "\n".join(logs)}
+            return {"name": self.name, "status": "Failed", "details": logs.getvalue()}
+
+    def _probe_java(
+        self,
+        executor: RemoteExecutor,
+        command: str,
+        extract: Callable[[str, str], str],
+    ) -> str:
+        """Return the installed Java's version text ("" if absent), reusing a cached hit."""
+        cached = executor.host_facts.get("java_version")
+        if cached:
+            return cached
+        version = extract(*executor.run(command))
+        if version:
+            # Only cache a hit; a missing Java is about to be installed
+            executor.remember("java_version", version)
+        return version
+
+    def _linux_java_version(self, out: str, err: str) -> str:
+        text = out + err
+        return text if "version" in text.lower() else ""
+
+    def _windows_java_version(self, out: str, err: str) -> str:
+        try:
+            probe = json.loads(out.strip() or "{}")
+        except ValueError:
+            return ""
+        version = probe.get("Version") or ""
+        return version if "version" in version.lower() else ""
 
-    def _missing_config(self, path: str, logs) -> Dict[str, Any]:
+    def _missing_config(self, path: str, logs: LogBuffer) -> Dict[str, Any]:
         logs.append(f"Missing required configuration: {path}")
         return {
             "name": self.name,
             "status": "Failed",
             "command": "remote_java_install",
             "output": "",
-            "details": "\n".join(logs),
+            "details": logs.getvalue(),
         }
 
-    def _ensure_directory(self, executor: RemoteExecutor, path: str) -> None:
-        literal = _to_ps_literal(path)
-        command = (
-            "powershell -Command \""
-            f"$path = {literal};"
-            "if (!(Test-Path -Path $path)) {"
-            "    New-Item -ItemType Directory -Force -Path $path | Out-Null"
-            "}"
-            "\""
-        )
-        executor.run(command)
+    def _ensure_directories(self, paths: Sequence[str]) -> str:
+        return self._ENSURE_DIRS_TMPL.format(literals=", ".join(_to_ps_literal(path) for path in paths))
+
+    def _encoded_powershell(self, script: str) -> str:
+        encoded = base64.b64encode(script.encode("utf-16-le")).decode("ascii")
+        return f"powershell -NoProfile -EncodedCommand {encoded}"
@@ -1,14 +1,39 @@
+import csv
+import itertools
+import json
 import re
 from typing import Any, Dict, Iterable, List, Optional
 
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 from Remote.remote_executor import RemoteExecutor
 
+# Every ":<port>" token of a netstat/ss row, local and foreign address alike
+_PORT_RE = re.compile(r":(\d+)(?:\s|$)")
+_DIGITS_RE = re.compile(r"\d+")
+
 
 class RemotePortCheckTool(RemoteTool):
     """Inspect remote ports to determine if they are currently in use."""
 
     config_path = ("pre_install", "port_check")
+    __slots__ = ()
+
+    # Kernel-side filter by local port with owning process names resolved in the same call;
+    # prints UNSUPPORTED on hosts without the NetTCPIP module (pre-2012 Windows)
+    _NETTCP_TMPL = (
+        "powershell -NoProfile -Command \""
+        "$ErrorActionPreference = 'SilentlyContinue';"
+        "if (-not (Get-Command Get-NetTCPConnection)) {{ Write-Output 'UNSUPPORTED'; exit 0 }};"
+        "$names = @{{}};"
+        "$rows = @(Get-NetTCPConnection -LocalPort {ports} | ForEach-Object {{"
+        "  if (-not $names.ContainsKey($_.OwningProcess)) {{"
+        "    $names[$_.OwningProcess] = (Get-Process -Id $_.OwningProcess).ProcessName"
+        "  }};"
+        "  [PSCustomObject]@{{ Port = $_.LocalPort; Address = $_.LocalAddress; State = [string]$_.State;"
+        " Pid = $_.OwningProcess; Name = $names[$_.OwningProcess] }}"
+        "}});"
+        "ConvertTo-Json -Compress -InputObject $rows\""
+    )
 
     def __init__(self) -> None:
         super().__init__(
@@ -29,7 +54,7 @@ class RemotePortCheckTool(RemoteTool):
         config: Dict[str, Any],
         ports: Optional[Iterable[int]] = None,
     ) -> Dict[str, Any]:
-        logs: List[str] = []
+        logs = LogBuffer()
         try:
             os_type = executor.detect_os()
             logs.append(f"Detected OS: {os_type}")
@@ -54,55 +79,69 @@ class RemotePortCheckTool(RemoteTool):
         self,
         executor: RemoteExecutor,
         ports: List[int],
-        logs: List[str],
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
-        summary: List[str] = []
-        stdout, stderr = executor.run("netstat -ano")
-        raw_lines = (stdout + "\n" + stderr).splitlines()
+        command = self._NETTCP_TMPL.format(ports=",".join(str(port) for port in ports))
+        stdout, _ = executor.run(command, combine_stderr=True)
+        payload = stdout.strip()
+        if payload.startswith("["):
+            return self._report(self._parse_nettcp(payload, ports), "Get-NetTCPConnection", logs)
+        logs.append("Get-NetTCPConnection unavailable, falling back to netstat")
+
+        stdout, stderr = executor.run("netstat -ano", combine_stderr=True)
+        port_matches = self._match_ports(itertools.chain(stdout.splitlines(), stderr.splitlines()), ports)
+        processes = self._lookup_windows_processes(executor, port_matches)
+        return self._report(self._summarize(port_matches, processes), "netstat -ano", logs)
 
-        for port in ports:
-            matches = [line for line in raw_lines if self._contains_port(line, port)]
-            if not matches:
-                summary.append(f"Port {port}: free")
-                continue
+    def _check_linux(
+        self,
+        executor: RemoteExecutor,
+        ports: List[int],
+        logs: LogBuffer,
+    ) -> Dict[str, Any]:
+        stdout, stderr = executor.run('bash -lc "ss -ltnp"', combine_stderr=True)
+        if not (stdout.strip() or stderr.strip()):
+            stdout, stderr = executor.run('bash -lc "netstat -tulpn"', combine_stderr=True)
 
-            summary.append(f"Port {port}: IN USE")
-            for line in matches:
-                summary.append(f"  {line.strip()}")
-                pid = self._extract_pid(line)
-                if pid:
-                    task_cmd = f'tasklist /FI "PID eq {pid}"'
-                    task_out, task_err = executor.run(task_cmd)
-                    task_lines = (task_out + "\n" + task_err).strip()
-                    if task_lines:
-                        summary.append(f"    {task_lines}")
+        port_matches = self._match_ports(itertools.chain(stdout.splitlines(), stderr.splitlines()), ports)
+        processes = self._lookup_linux_processes(executor, port_matches)
+        return self._report(self._summarize(port_matches, processes), "ss -ltnp | netstat -tulpn", logs)
 
+    def _report(self, summary: List[str], command: str, logs: LogBuffer) -> Dict[str, Any]:
         status = "Success" if all("free" in s.lower() for s in summary if s.startswith("Port")) else "Failed"
-        logs.extend(summary)
+        for line in summary:
+            logs.append(line)
         return {
             "name": self.name,
             "status": status,
-            "command": "netstat -ano",
+            "command": command,
             "details": "\n".join(summary),
-            "output": "\n".join(logs),
+            "output": logs.getvalue(),
         }
 
-    def _check_linux(
+    def _parse_nettcp(self, payload: str, ports: List[int]) -> List[str]:
+        port_matches: Dict[int, List[str]] = {port: [] for port in ports}
+        processes: Dict[str, str] = {}
+        for row in json.loads(payload):
+            port = int(row.get("Port") or 0)
+            if port not in port_matches:
+                continue
+            pid = str(row.get("Pid", ""))
+            address = str(row.get("Address", ""))
+            if ":" in address:
+                address = f"[{address}]"
+            port_matches[port].append(f"TCP {address}:{port} {row.get('State')} {pid}")
+            if row.get("Name"):
+                processes[pid] = f"PID {pid}: {row['Name']}"
+        return self._summarize(port_matches, processes)
+
+    def _summarize(
         self,
-        executor: RemoteExecutor,
-        ports: List[int],
-        logs: List[str],
-    ) -> Dict[str, Any]:
+        port_matches: Dict[int, List[str]],
+        processes: Dict[str, str],
+    ) -> List[str]:
         summary: List[str] = []
-        stdout, stderr = executor.run('bash -lc "ss -ltnp"')
-        content = (stdout + "\n" + stderr).strip()
-        if not content:
-            stdout, stderr = executor.run('bash -lc "netstat -tulpn"')
-            content = (stdout + "\n" + stderr).strip()
-        lines = content.splitlines()
-
-        for port in ports:
-            matches = [line for line in lines if self._contains_port(line, port)]
+        for port, matches in port_matches.items():
             if not matches:
                 summary.append(f"Port {port}: free")
                 continue
@@ -110,27 +149,60 @@ class RemotePortCheckTool(RemoteTool):
             summary.append(f"Port {port}: IN USE")
             for line in matches:
                 summary.append(f"  {line.strip()}")
-                pid = self._extract_pid(line)
-                if pid:
-                    proc_cmd = f"bash -lc \"ps -p {pid} -o pid,cmd --no-headers\""
-                    proc_out, proc_err = executor.run(proc_cmd)
-                    proc_info = (proc_out + "\n" + proc_err).strip()
-                    if proc_info:
-                        summary.append(f"    {proc_info}")
+                info = processes.get(self._extract_pid(line) or "")
+                if info:
+                    summary.append(f"    {info}")
+        return summary
 
-        status = "Success" if all("free" in s.lower() for s in summary if s.startswith("Port")) else "Failed"
-        logs.extend(summary)
-        return {
-            "name": self.name,
-            "status": status,
-            "command": "ss -ltnp | netstat -tulpn",
-            "details": "\n".join(summary),
-            "output": "\n".join(logs),
-        }
+    def _collect_pids(self, port_matches: Dict[int, List[str]]) -> List[str]:
+        pids = {self._extract_pid(line) for matches in port_matches.values() for line in matches}
+        pids.discard(None)
+        return sorted(pids, key=int)
 
-    def _contains_port(self, line: str, port: int) -> bool:
-        pattern = rf":{port}(?:\s|$)"
-        return re.search(pattern, line) is not None
+    def _lookup_windows_processes(
+        self,
+        executor: RemoteExecutor,
+        port_matches: Dict[int, List[str]],
+    ) -> Dict[str, str]:
+        # One tasklist for every owning PID instead of a filtered call per netstat line
+        pids = set(self._collect_pids(port_matches))
+        if not pids:
+            return {}
+        task_out, _ = executor.run("tasklist /FO CSV /NH", combine_stderr=True)
+        processes: Dict[str, str] = {}
+        for row in csv.reader(task_out.splitlines()):
+            if len(row) >= 2 and row[1] in pids:
+                processes[row[1]] = f"PID {row[1]}: {row[0]}"
+        return processes
+
+    def _lookup_linux_processes(
+        self,
+        executor: RemoteExecutor,
+        port_matches: Dict[int, List[str]],
+    ) -> Dict[str, str]:
+        pids = self._collect_pids(port_matches)
+        if not pids:
+            return {}
+        proc_cmd = f"bash -lc \"ps -p {','.join(pids)} -o pid,cmd --no-headers\""
+        proc_out, _ = executor.run(proc_cmd, combine_stderr=True)
+        processes: Dict[str, str] = {}
+        for line in proc_out.splitlines():
+            parts = line.split(None, 1)
+            if parts and parts[0] in pids:
+                processes[parts[0]] = line.strip()
+        return processes
+
+    def _match_ports(self, lines: Iterable[str], ports: List[int]) -> Dict[int, List[str]]:
+        """Group lines by every wanted port they mention, in one regex pass per line."""
+        port_matches: Dict[int, List[str]] = {port: [] for port in ports}
+        for line in lines:
+            seen = set()
+            for found in _PORT_RE.findall(line):
+                port = int(found)
+                if port in port_matches and port not in seen:
+                    seen.add(port)
+                    port_matches[port].append(line)
+        return port_matches
 
     def _extract_pid(self, line: str) -> Optional[str]:
         pid_match = re.search(r"pid=(\d+)", line)
@@ -141,26 +213,24 @@ class RemotePortCheckTool(RemoteTool):
             return parts[-1]
         return None
 
-    def _normalize_ports(self, ports: Iterable[Any]) -> List[int]:
-        normalized: List[int] = []
+    def _normalize_ports(self, ports: Any) -> List[int]:
+        """Sorted unique ports from a list, or from a string such as "8080, 8005"."""
+        if isinstance(ports, str):
+            # One regex pass; iterating the string would yield single digits
+            return sorted(set(map(int, _DIGITS_RE.findall(ports))))
+        normalized = set()
         for item in ports:
-            if isinstance(item, str):
-                try:
-                    normalized.append(int(item.strip()))
-                except ValueError:
-                    continue
-            else:
-                try:
-                    normalized.append(int(item))
-                except (TypeError, ValueError):
-                    continue
-        return sorted(set(normalized))
-
-    def _failure(self, message: str, logs: List[str]) -> Dict[str, Any]:
+            try:
+                normalized.add(int(item.strip() if isinstance(item, str) else item))
+            except (TypeError, ValueError):
+                continue
+        return sorted(normalized)
+
+    def _failure(self, message: str, logs: LogBuffer) -> Dict[str, Any]:
         return {
             "name": self.name,
             "status": "Failed",
             "command": self.name,
             "details": message,
-            "output": "\n".join(logs),
+            "output": logs.getvalue(),
         }
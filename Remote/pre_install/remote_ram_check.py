@@ -1,13 +1,18 @@
+import re
 from typing import Any, Dict, Optional
 
-from Remote.tool_base import RemoteTool
+from Remote.tool_base import LogBuffer, RemoteTool
 from Remote.remote_executor import RemoteExecutor
 
+_KV_RE = re.compile(r"(TOTAL|FREE)=(\d+(?:\.\d+)?)")
+_MEMINFO_RE = re.compile(r"^(MemTotal|MemAvailable|MemFree):\s+(\d+)", re.M)
+
 
 class RemoteRamCheckTool(RemoteTool):
     """Check total and available RAM on a remote Windows or Linux host."""
 
     config_path = ("pre_install", "ram_check")
+    __slots__ = ()
 
     def __init__(self) -> None:
         super().__init__(
@@ -28,7 +33,7 @@ class RemoteRamCheckTool(RemoteTool):
         config: Dict[str, Any],
         min_mb: Optional[int] = None,
     ) -> Dict[str, Any]:
-        logs = []
+        logs = LogBuffer()
         try:
             os_type = executor.detect_os()
             logs.append(f"Detected OS: {os_type}")
@@ -43,7 +48,7 @@ class RemoteRamCheckTool(RemoteTool):
             else:
                 return self._failure("Unsupported operating system", logs)
 
-            result.setdefault("output", "\n".join(logs))
+            result.setdefault("output", logs.getvalue())
             return result
 
         except Exception as exc:  # pragma: no cover - defensive handling for remote execution
@@ -54,7 +59,7 @@ class RemoteRamCheckTool(RemoteTool):
         self,
         executor: RemoteExecutor,
         threshold: int,
-        logs: Any,
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
         command = (
             "powershell -NoProfile -Command \""
@@ -64,7 +69,7 @@ class RemoteRamCheckTool(RemoteTool):
             "$free = [math]::Round($os.FreePhysicalMemory/1KB,0);"
             "Write-Output (\\\"TOTAL=$total;FREE=$free\\\");\""
         )
-        stdout, stderr = executor.run(command)
+        stdout, stderr = executor.run(command, combine_stderr=True)
         payload = (stdout + stderr).strip()
         logs.append(payload or "No output")
         metrics = self._parse_metrics(payload)
@@ -90,14 +95,16 @@ class RemoteRamCheckTool(RemoteTool):
         self,
         executor: RemoteExecutor,
         threshold: int,
-        logs: Any,
+        logs: LogBuffer,
     ) -> Dict[str, Any]:
-        command = "bash -lc \"free -m\""
+        # Read the kernel counters directly: no login shell, no free(1), no locale-dependent layout
+        command = "cat /proc/meminfo"
         stdout, stderr = executor.run(command)
-        logs.extend(filter(None, [stdout.strip(), stderr.strip()]))
-        metrics = self._parse_linux_free(stdout)
+        logs.append(stderr.strip())
+        metrics = self._parse_meminfo(stdout)
         if not metrics:
-            return self._failure("Unable to parse free -m output", logs)
+            return self._failure("Unable to parse /proc/meminfo", logs)
+        logs.append(f"MemTotal {metrics['total_mb']:.0f} MB, MemAvailable {metrics['free_mb']:.0f} MB")
 
         status = "Success" if metrics["total_mb"] >= threshold else "Failed"
         details = (
@@ -115,40 +122,25 @@ class RemoteRamCheckTool(RemoteTool):
         }
 
     def _parse_metrics(self, payload: str) -> Optional[Dict[str, float]]:
-        parts = payload.replace("\r", "").split(";")
-        metrics: Dict[str, float] = {}
-        for part in parts:
-            if "=" not in part:
-                continue
-            key, value = part.split("=", 1)
-            try:
-                metrics[f"{key.lower()}_mb"] = float(value)
-            except ValueError:
-                continue
+        metrics = {f"{key.lower()}_mb": float(value) for key, value in _KV_RE.findall(payload)}
         return metrics if "total_mb" in metrics else None
 
-    def _parse_linux_free(self, output: str) -> Optional[Dict[str, float]]:
-        for line in output.splitlines():
-            normalized = line.strip().lower()
-            if normalized.startswith("mem:"):
-                parts = line.split()
-                if len(parts) >= 7:
-                    try:
-                        total_mb = float(parts[1])
-                        free_mb = float(parts[6])
-                    except ValueError:
-                        return None
-                    return {
-                        "total_mb": total_mb,
-                        "free_mb": free_mb,
-                    }
-        return None
-
-    def _failure(self, message: str, logs: Any) -> Dict[str, Any]:
+    def _parse_meminfo(self, output: str) -> Optional[Dict[str, float]]:
+        values = dict(_MEMINFO_RE.findall(output))
+        if "MemTotal" not in values:
+            return None
+        # MemAvailable is what free(1) reports as "available"; kernels before 3.14 lack it
+        available = values.get("MemAvailable", values.get("MemFree", "0"))
+        return {
+            "total_mb": float(int(values["MemTotal"]) >> 10),
+            "free_mb": float(int(available) >> 10),
+        }
+
+    def _failure(self, message: str, logs: LogBuffer) -> Dict[str, Any]:
         return {
             "name": self.name,
             "status": "Failed",
             "command": self.name,
             "details": message,
-            "output": "\n".join(str(item) for item in logs),
+            "output": logs.getvalue(),
         }
@@ -1,84 +1,399 @@
+import codecs
+import functools
+import os
+import re
+import select
+import shlex
 import time
+
 import paramiko
 
+from Remote import host_cache
+from Remote.ssh_pool import pool, pool_key
+
+KEEPALIVE_INTERVAL = 30
+RECV_BUFFER_SIZE = 65536
+# Upper bound on one wait, so an exit status sent without EOF is still noticed
+MAX_SELECT_WAIT = 1.0
+
+
+# uname prints "Linux" on its own line; cmd.exe's ver prints "Microsoft Windows [Version ...]"
+_OS_RE = re.compile(r"^(Linux)\b|\b(Windows)\b", re.M)
+
+# Printed after every run_script step as "<marker> <index> <exit status>"
+_STEP_MARKER = "__RUN_SCRIPT_STEP__"
+_STEP_RE = re.compile(rf"^{_STEP_MARKER} (\d+) (\d+)$")
+
+# Tried in order; DSSKey is looked up lazily because newer paramiko releases drop it
+_KEY_CLASSES = ("Ed25519Key", "ECDSAKey", "RSAKey", "DSSKey")
+
+
+@functools.lru_cache(maxsize=32)
+def _load_pkey(key_path, mtime):
+    """Parse a private key file of any supported type; cached until the file changes."""
+    last_error = None
+    for class_name in _KEY_CLASSES:
+        key_class = getattr(paramiko, class_name, None)
+        if key_class is None:
+            continue
+        try:
+            return key_class.from_private_key_file(key_path)
+        except paramiko.SSHException as exc:
+            last_error = exc
+    raise paramiko.SSHException(f"Unsupported or unreadable private key {key_path}: {last_error}")
+
+
+def _private_key(key_path):
+    return _load_pkey(key_path, os.stat(key_path).st_mtime_ns)
+
+
+def close_all_connections():
+    """Close every pooled SSH connection."""
+    pool.close_all()
+
+
 class RemoteExecutor:
-    def __init__(self, host, username, password=None, key_path=None):
+    def __init__(self, host, username, password=None, key_path=None, port=22, pooled=True):
         self.host = host
         self.username = username
         self.password = password
         self.key_path = key_path
+        self.port = port
+        self.pooled = pooled
         self.client = None
+        self._os_type = None
+        # Set when a broken client was dropped, so the next command reconnects on its own
+        self._reconnect = False
 
     def connect(self):
-        self.client = paramiko.SSHClient()
-        self.client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        if self.client:
+            self.close()
+        self._reconnect = False
+        if not self.pooled:
+            self.client = self._open_client()
+            return
+        # Successive executors for the same target share one TCP + key exchange + auth handshake
+        self.client = pool.acquire(self._pool_key(), self._open_client)
+
+    def _pool_key(self):
+        return pool_key(self.host, self.port, self.username, self.password, self.key_path)
+
+    def _open_client(self):
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
 
         if self.key_path:
-            key = paramiko.RSAKey.from_private_key_file(self.key_path)
-            self.client.connect(self.host, username=self.username, pkey=key)
+            key = _private_key(self.key_path)
+            client.connect(self.host, port=self.port, username=self.username, pkey=key)
         else:
-            self.client.connect(self.host, username=self.username, password=self.password)
+            client.connect(self.host, port=self.port, username=self.username, password=self.password)
+
+        transport = client.get_transport()
+        if transport:
+            # Equivalent of ServerAliveInterval: keeps idle pooled sessions from being dropped
+            transport.set_keepalive(KEEPALIVE_INTERVAL)
+        return client
 
-    def run(self, command, timeout=None):
+    def __enter__(self):
         if not self.client:
-            raise RuntimeError("RemoteExecutor is not connected")
+            self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
+    def _open_channel(self):
         transport = self.client.get_transport()
         if not transport:
             raise RuntimeError("SSH transport is not available")
+        try:
+            return transport.open_session()
+        except (paramiko.SSHException, EOFError):
+            # Dropped connection (e.g. a pooled client the server timed out): reconnect once.
+            # Safe to retry because nothing has been executed on the channel yet.
+            self._discard_client()
+            self.connect()
+            return self.client.get_transport().open_session()
 
-        channel = transport.open_session()
-        if timeout and timeout > 0:
-            channel.settimeout(timeout)
+    def _discard_client(self):
+        client, self.client = self.client, None
+        # Re-probe after reconnecting; the new client starts with empty host facts
+        self._os_type = None
+        self._reconnect = True
+        if self.pooled:
+            # Other executors may still hold leases on the same client: unpool it now,
+            # close it when the last of them (including this one) lets go
+            key = self._pool_key()
+            pool.invalidate(key, client)
+            pool.release(key, client)
+        else:
+            try:
+                client.close()
+            except Exception:
+                pass
+
+    def run(self, command, timeout=None, combine_stderr=False):
+        """Run ``command`` and return ``(stdout, stderr)``.
 
-        channel.exec_command(command)
-        stdout_chunks = []
-        stderr_chunks = []
-        start_time = time.time()
+        With ``combine_stderr`` the server interleaves stderr into stdout on the one
+        channel stream; use it when the caller merges both streams anyway.
+        """
+        buffers = {"stdout": bytearray(), "stderr": bytearray()}
+        exit_status = 0
+        for stream, data in self._pump(command, timeout, combine_stderr):
+            if stream == "exit":
+                exit_status = data
+            else:
+                buffers[stream] += data
 
-        while True:
+        # bytearray decodes in place, without first copying into an immutable bytes
+        stdout_data = buffers["stdout"].decode(errors="replace")
+        stderr_data = buffers["stderr"].decode(errors="replace")
+
+        if exit_status != 0 and not stderr_data:
+            stderr_data = f"Command exited with status {exit_status}"
+
+        return stdout_data, stderr_data
+
+    def run_stream(self, command, timeout=None):
+        """Yield ``(stream, line)`` pairs (``"stdout"``/``"stderr"``) as the command produces them.
+
+        Mirrors :meth:`run`: a non-zero exit with no stderr output yields a final
+        ``("stderr", "Command exited with status N")`` line.
+        """
+        decoders = {
+            "stdout": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+            "stderr": codecs.getincrementaldecoder("utf-8")(errors="replace"),
+        }
+        pending = {"stdout": "", "stderr": ""}
+        saw_stderr = False
+        exit_status = 0
+        for stream, data in self._pump(command, timeout):
+            if stream == "exit":
+                exit_status = data
+                continue
+            saw_stderr = saw_stderr or stream == "stderr"
+            lines = (pending[stream] + decoders[stream].decode(data)).split("\n")
+            pending[stream] = lines.pop()
+            for line in lines:
+                yield stream, line.rstrip("\r")
+        for stream, decoder in decoders.items():
+            tail = (pending[stream] + decoder.decode(b"", final=True)).rstrip("\r")
+            if tail:
+                yield stream, tail
+        if exit_status != 0 and not saw_stderr:
+            yield "stderr", f"Command exited with status {exit_status}"
+
+    def _pump(self, command, timeout, combine_stderr=False):
+        """Yield raw ``(stream, bytes)`` chunks, then a final ``("exit", status)``."""
+        if not self.client:
+            if not self._reconnect:
+                raise RuntimeError("RemoteExecutor is not connected")
+            self.connect()
+
+        channel = self._open_channel()
+        try:
+            if timeout and timeout > 0:
+                channel.settimeout(timeout)
+            if combine_stderr:
+                channel.set_combine_stderr(True)
+
+            try:
+                channel.exec_command(command)
+            except paramiko.SSHException:
+                # The command may have reached the server, so evict rather than retry
+                self._discard_client()
+                raise
+            deadline = time.monotonic() + timeout if timeout and timeout > 0 else None
+
+            while True:
+                while channel.recv_ready():
+                    yield "stdout", channel.recv(RECV_BUFFER_SIZE)
+                while channel.recv_stderr_ready():
+                    yield "stderr", channel.recv_stderr(RECV_BUFFER_SIZE)
+
+                if channel.exit_status_ready() or channel.eof_received:
+                    break
+
+                wait = MAX_SELECT_WAIT
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(f"Remote command timed out after {timeout} seconds")
+                    wait = min(wait, remaining)
+
+                # The channel's fd becomes readable on stdout/stderr data or EOF, so this
+                # wakes as soon as output arrives instead of on a fixed polling tick
+                select.select([channel], [], [], wait)
+
+            exit_status = channel.recv_exit_status()
             while channel.recv_ready():
-                stdout_chunks.append(channel.recv(4096))
+                yield "stdout", channel.recv(RECV_BUFFER_SIZE)
             while channel.recv_stderr_ready():
-                stderr_chunks.append(channel.recv_stderr(4096))
+                yield "stderr", channel.recv_stderr(RECV_BUFFER_SIZE)
+            yield "exit", exit_status
+        finally:
+            channel.close()
 
-            if channel.exit_status_ready():
-                break
+    def run_batch(self, commands, os_type, timeout=None):
+        """Run several shell statements in a single remote invocation.
 
-            if timeout and timeout > 0 and (time.time() - start_time) > timeout:
-                channel.close()
-                raise TimeoutError(f"Remote command timed out after {timeout} seconds")
+        PowerShell statements are joined with ``;`` inside one ``-Command`` block,
+        bash statements with ``&&`` so the chain stops at the first failure.
+        """
+        statements = [command for command in commands if command]
+        if not statements:
+            return "", ""
 
-            time.sleep(0.1)
+        if os_type == "windows":
+            script = "; ".join(statements)
+            return self.run(f"powershell -NoProfile -Command \"& {{ {script} }}\"", timeout=timeout)
 
-        exit_status = channel.recv_exit_status()
-        while channel.recv_ready():
-            stdout_chunks.append(channel.recv(4096))
-        while channel.recv_stderr_ready():
-            stderr_chunks.append(channel.recv_stderr(4096))
+        script = " && ".join(statements)
+        return self.run(f"bash -lc {shlex.quote(script)}", timeout=timeout)
 
-        channel.close()
+    def run_script(self, steps, timeout=None):
+        """Run bash ``steps`` in one remote invocation and return per-step results.
 
-        stdout_data = b"".join(stdout_chunks).decode(errors="replace")
-        stderr_data = b"".join(stderr_chunks).decode(errors="replace")
+        Returns ``[(output, exit_status), ...]`` for the steps that ran, each with its
+        stdout and stderr interleaved; execution stops after the first failing step.
+        A step that ends the shell itself (e.g. ``exit``) is reported with status -1.
+        """
+        lines = []
+        for index, step in enumerate(steps):
+            lines.append(
+                f"{{ {step}\n}}; __rc=$?; printf '\\n{_STEP_MARKER} %d %d\\n' {index} \"$__rc\"; "
+                f'[ "$__rc" -eq 0 ] || exit "$__rc"'
+            )
+        if not lines:
+            return []
+        stdout, _ = self.run(f"bash -lc {shlex.quote(chr(10).join(lines))}", timeout=timeout, combine_stderr=True)
 
-        if exit_status != 0 and not stderr_data:
-            stderr_data = f"Command exited with status {exit_status}"
+        results = []
+        current = []
+        for line in stdout.split("\n"):
+            match = _STEP_RE.match(line.rstrip("\r"))
+            if match:
+                # The marker's leading newline ends the step's last line; drop that extra line
+                if current and current[-1] == "":
+                    current.pop()
+                results.append(("\n".join(current), int(match.group(2))))
+                current = []
+            else:
+                current.append(line)
+        leftover = "\n".join(current).strip()
+        if leftover:
+            if results and results[-1][1] != 0:
+                # Late stderr of the failed step
+                output, status = results[-1]
+                results[-1] = ("\n".join(filter(None, (output, leftover))), status)
+            elif len(results) < len(lines):
+                results.append((leftover, -1))
+        return results
 
-        return stdout_data, stderr_data
+    @property
+    def host_facts(self):
+        """Facts cached on the current SSH connection and shared by every executor using it.
+
+        Pooled executors for the same target see one dict, so a later tool invocation
+        reuses earlier probes. A new connection starts from the facts persisted by
+        :meth:`remember` in earlier runs, as long as the host key still matches.
+        """
+        if not self.client:
+            return {}
+        return pool.facts(self.client, self._load_persisted_facts)
+
+    def remember(self, key, value):
+        """Cache a probed fact on this connection and on disk for later runs."""
+        self.host_facts[key] = value
+        fingerprint = self._host_fingerprint()
+        if fingerprint:
+            host_cache.update(self.host, fingerprint, **{key: value})
+
+    def _load_persisted_facts(self):
+        fingerprint = self._host_fingerprint()
+        return host_cache.load(self.host, fingerprint) if fingerprint else {}
+
+    def _host_fingerprint(self):
+        # A reinstalled host presents a new host key, which invalidates its cached facts
+        try:
+            return self.client.get_transport().get_remote_server_key().get_fingerprint().hex()
+        except Exception:
+            return ""
 
     def detect_os(self):
-        # Linux check
-        out, _ = self.run("uname")
-        if "Linux" in out:
-            return "linux"
+        # The OS cannot change within a session; only probe the host once per connection
+        if self._os_type is None:
+            facts = self.host_facts
+            os_type = facts.get("os_type")
+            if not os_type:
+                os_type = self._probe_os()
+                if os_type == "unknown":
+                    return os_type
+                self.remember("os_type", os_type)
+            self._os_type = os_type
+        return self._os_type
+
+    def _probe_os(self):
+        # One round trip for both common cases: POSIX shells print "Linux" from uname,
+        # while cmd.exe (the Windows OpenSSH default shell) fails it and falls through to ver
+        out, _ = self.run("uname || ver")
+        match = _OS_RE.search(out)
+        if match:
+            return "linux" if match.group(1) else "windows"
 
-        # Windows check
+        # PowerShell as the default shell cannot parse "||" (5.1) or has no ver builtin
         out, _ = self.run("powershell \"(Get-WmiObject Win32_OperatingSystem).Caption\"")
         if out.strip():
             return "windows"
 
         return "unknown"
 
+    def probe_port(self, port, host="127.0.0.1", timeout=2.0):
+        """Check whether ``host:port`` accepts TCP connections, as seen from the remote host.
+
+        Opens a ``direct-tcpip`` channel on the existing transport, so no remote shell is
+        spawned. Returns True when the port accepts, False only when the remote host
+        definitely refused the connection, and None when the answer is unknown (port
+        forwarding disabled, channel-open timeout, other failures); callers then fall back
+        to a shell probe or act as if the port might be open.
+        """
+        if not self.client:
+            raise RuntimeError("RemoteExecutor is not connected")
+        transport = self.client.get_transport()
+        if not transport:
+            raise RuntimeError("SSH transport is not available")
+        try:
+            channel = transport.open_channel(
+                "direct-tcpip", (host, int(port)), ("127.0.0.1", 0), timeout=timeout
+            )
+        except paramiko.ChannelException as exc:
+            # 2 = connect failed; OpenSSH reports ECONNREFUSED as "Connection refused".
+            # Prohibited forwarding, unreachable hosts and timeouts say nothing about the port
+            refused = exc.code == 2 and "refused" in (exc.text or "").lower()
+            return False if refused else None
+        except paramiko.SSHException:
+            # Includes "Timeout opening channel." on a slow link
+            return None
+        channel.close()
+        return True
+
+    def upload(self, local_path, remote_path):
+        """Copy a local file to ``remote_path`` over SFTP on the existing connection."""
+        if not self.client:
+            raise RuntimeError("RemoteExecutor is not connected")
+        sftp = self.client.open_sftp()
+        try:
+            sftp.put(local_path, remote_path)
+        finally:
+            sftp.close()
+
     def close(self):
-        self.client.close()
+        if not self.client:
+            return
+        client, self.client = self.client, None
+        if not self.pooled:
+            client.close()
+            return
+        # Pooled clients stay open for the next executor targeting the same host
+        pool.release(self._pool_key(), client)
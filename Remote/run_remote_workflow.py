@@ -1,25 +1,35 @@
+from __future__ import annotations
+
 import argparse
-from typing import Any, Dict, Optional
+import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
+from Remote import host_cache
 from Remote.remote_executor import RemoteExecutor
 from Remote.utilities.config_loader import load_server_ini, load_yaml
-from Remote.pre_install.remote_java_install import RemoteJavaInstallTool
-from Remote.install.remote_tomcat_install import RemoteTomcatInstallTool
-from Remote.post_install import (
-    RemoteTomcatStartTool,
-    RemoteTomcatStopTool,
-    RemoteTomcatValidationTool,
-)
+from Remote.orchestrate import install_and_validate
+
+if TYPE_CHECKING:
+    from Remote.pre_install.remote_java_install import RemoteJavaInstallTool
+
+MAX_PARALLEL_SERVERS = 32
 
 
 class RemoteWorkflowRunner:
     def __init__(self, settings: Dict[str, Any]):
         self.settings = settings
-        self.java_tool = RemoteJavaInstallTool()
-        self.tomcat_install_tool = RemoteTomcatInstallTool()
-        self.tomcat_start_tool = RemoteTomcatStartTool()
-        self.tomcat_validation_tool = RemoteTomcatValidationTool()
-        self.tomcat_stop_tool = RemoteTomcatStopTool()
+        self._java_tool: Optional[RemoteJavaInstallTool] = None
+
+    @property
+    def java_tool(self) -> RemoteJavaInstallTool:
+        # Imported on first use: the installer pulls in the download helpers and requests
+        if self._java_tool is None:
+            from Remote.pre_install.remote_java_install import RemoteJavaInstallTool
+
+            self._java_tool = RemoteJavaInstallTool()
+        return self._java_tool
 
     def run_for_server(self, server: Dict[str, Any]) -> Dict[str, Any]:
         results: Dict[str, Any] = {"server": server.get("name", server.get("host"))}
@@ -49,62 +59,8 @@ class RemoteWorkflowRunner:
                 if java_result.get("status") != "Success":
                     return results
 
-            # Install: Tomcat
-            install_cfg = self.settings.get("install", {}).get("tomcat")
-            tomcat_home = None
-            if install_cfg:
-                install_result = self.tomcat_install_tool.run(executor, install_cfg)
-                results["install_tomcat"] = install_result
-                if install_result.get("status") != "Success":
-                    return results
-                tomcat_home = install_result.get("tomcat_home")
-
-            # Post-install
-            post_cfg = self.settings.get("post_install", {})
-            start_cfg = post_cfg.get("tomcat_start")
-            validation_cfg = post_cfg.get("tomcat_validation")
-            stop_cfg = post_cfg.get("tomcat_stop")
-
-            default_home = post_cfg.get("default_tomcat_home") if isinstance(post_cfg, dict) else None
-            effective_home = (
-                tomcat_home
-                or default_home
-                or (start_cfg or {}).get("tomcat_home")
-                or (validation_cfg or {}).get("tomcat_home")
-                or (stop_cfg or {}).get("tomcat_home")
-            )
-
-            if start_cfg:
-                start_result = self.tomcat_start_tool.run(
-                    executor=executor,
-                    config=start_cfg,
-                    tomcat_home=effective_home,
-                )
-                results["post_install_tomcat_start"] = start_result
-
-            if validation_cfg:
-                if effective_home:
-                    validation_result = self.tomcat_validation_tool.run(
-                        executor=executor,
-                        config=validation_cfg,
-                        server=server,
-                        tomcat_home=effective_home,
-                    )
-                    results["post_install_tomcat_validation"] = validation_result
-                else:
-                    results["post_install_tomcat_validation"] = {
-                        "status": "Skipped",
-                        "details": "Tomcat home not available for validation",
-                    }
-
-            if stop_cfg:
-                stop_result = self.tomcat_stop_tool.run(
-                    executor=executor,
-                    config=stop_cfg,
-                    tomcat_home=effective_home,
-                )
-                results["post_install_tomcat_stop"] = stop_result
-
+            # Install + post-install share the connection and cached OS detection
+            results.update(install_and_validate(executor, self.settings, server))
             return results
 
         finally:
@@ -124,29 +80,67 @@ def main() -> None:
         default="Remote/config/servers.ini",
         help="Path to server inventory INI file",
     )
+    parser.add_argument(
+        "--parallel",
+        type=int,
+        default=None,
+        metavar="N",
+        help=f"Number of servers to run concurrently (default: all, up to {MAX_PARALLEL_SERVERS}; 1 runs them one after another)",
+    )
+    parser.add_argument(
+        "--refresh-facts",
+        action="store_true",
+        help="Discard cached host facts (OS type, Java version) and probe every host again",
+    )
+    parser.add_argument(
+        "--json",
+        action="store_true",
+        help="Print each server's result as one compact JSON line (NDJSON) instead of the readable summary",
+    )
     args = parser.parse_args()
 
+    if args.refresh_facts:
+        host_cache.clear()
+
     settings = load_yaml(args.settings)
     servers = load_server_ini(args.servers)
 
     runner = RemoteWorkflowRunner(settings)
-
-    for server in servers:
-        result = runner.run_for_server(server)
-        server_name = server.get("name", server.get("host"))
-        print(f"=== Results for {server_name} ===")
-        for key, value in result.items():
-            if key == "server":
-                continue
-            if isinstance(value, dict):
-                status = value.get("status", "n/a")
-                details = value.get("details")
-                print(f" - {key}: {status}")
-                if details:
-                    print(f"   details: {details}")
-            else:
-                print(f" - {key}: {value}")
-        print()
+    workers = args.parallel or min(MAX_PARALLEL_SERVERS, len(servers))
+
+    # Each server gets its own executor, so runs only share the stateless tools;
+    # results are printed from this thread as each server finishes
+    emit = _print_json if args.json else _print_result
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        futures = {pool.submit(runner.run_for_server, server): server for server in servers}
+        for future in as_completed(futures):
+            emit(futures[future], future.result())
+
+
+def _print_json(server: Dict[str, Any], result: Dict[str, Any]) -> None:
+    # Results carry a "server" key already; default=str covers any non-JSON tool output
+    sys.stdout.write(json.dumps(result, separators=(",", ":"), default=str) + "\n")
+    sys.stdout.flush()
+
+
+def _print_result(server: Dict[str, Any], result: Dict[str, Any]) -> None:
+    # One write per server keeps each block contiguous and avoids a flush per line
+    server_name = server.get("name", server.get("host"))
+    lines = [f"=== Results for {server_name} ==="]
+    for key, value in result.items():
+        if key == "server":
+            continue
+        if isinstance(value, dict):
+            status = value.get("status", "n/a")
+            details = value.get("details")
+            lines.append(f" - {key}: {status}")
+            if details:
+                lines.append(f"   details: {details}")
+        else:
+            lines.append(f" - {key}: {value}")
+    lines.append("\n")
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,211 @@
+"""Process-wide pool of live SSH clients shared by RemoteExecutor instances."""
+
+import atexit
+import hashlib
+import threading
+import time
+import weakref
+from collections import OrderedDict
+
+MAX_CONNECTIONS = 64
+IDLE_TIMEOUT = 300
+REAP_INTERVAL = 60
+
+
+def pool_key(host, port, username, password, key_path):
+    """Key a pooled client by target and credentials; the password is stored only as a digest."""
+    secret = hashlib.sha256((password or "").encode("utf-8")).hexdigest()
+    return (host, port, username, key_path or "", secret)
+
+
+def is_alive(client):
+    transport = client.get_transport()
+    return bool(transport and transport.is_active())
+
+
+def _close_quietly(client):
+    try:
+        client.close()
+    except Exception:
+        pass
+
+
+class SSHConnectionPool:
+    """LRU-bounded map of pool keys to connected ``paramiko.SSHClient`` objects.
+
+    Clients are leased with :meth:`acquire` and handed back with :meth:`release`; a
+    background reaper closes clients that have sat unleased for ``idle_timeout`` seconds.
+    """
+
+    def __init__(self, max_connections=MAX_CONNECTIONS, idle_timeout=IDLE_TIMEOUT):
+        self.max_connections = max_connections
+        self.idle_timeout = idle_timeout
+        self._clients = OrderedDict()
+        # client -> number of executors currently holding it
+        self._leases = {}
+        # client -> time.monotonic() of its last release
+        self._idle_since = {}
+        self._lock = threading.RLock()
+        self._reaper = None
+        # Keyed weakly by client, so facts vanish with the connection they describe
+        self._facts = weakref.WeakKeyDictionary()
+
+    def acquire(self, key, connect):
+        """Lease a live client for ``key``, calling ``connect()`` to open one on a miss."""
+        self._ensure_reaper()
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None and is_alive(client):
+                self._clients.move_to_end(key)
+                self._lease(client)
+                return client
+
+        # Handshake outside the lock so connects to different hosts run concurrently
+        fresh = connect()
+        evicted = []
+        with self._lock:
+            current = self._clients.get(key)
+            if current is not None and current is not client and is_alive(current):
+                # Another thread connected the same target first; keep theirs
+                self._clients.move_to_end(key)
+                evicted.append(fresh)
+                fresh = current
+            else:
+                if current is not None:
+                    self._forget(current)
+                self._clients[key] = fresh
+                self._clients.move_to_end(key)
+            self._lease(fresh)
+            evicted.extend(self._trim())
+        if client is not None and client is not fresh:
+            evicted.append(client)
+        for stale in evicted:
+            _close_quietly(stale)
+        return fresh
+
+    def release(self, key, client):
+        """Hand a leased client back; it stays open for the next :meth:`acquire` of ``key``."""
+        with self._lock:
+            leases = self._leases.pop(client, 0) - 1
+            if leases > 0:
+                self._leases[client] = leases
+                return
+            if self._clients.get(key) is client:
+                self._idle_since[client] = time.monotonic()
+                return
+        # No longer pooled (replaced or removed while leased): nobody else will close it
+        _close_quietly(client)
+
+    def remove(self, key, client=None):
+        """Drop ``key`` (only if it still maps to ``client`` when given) and close the client."""
+        with self._lock:
+            current = self._clients.get(key)
+            if current is None or (client is not None and current is not client):
+                current = None
+            else:
+                del self._clients[key]
+            if client is not None:
+                self._forget(client)
+            if current is not None:
+                self._forget(current)
+        if current is not None:
+            _close_quietly(current)
+        elif client is not None:
+            _close_quietly(client)
+
+    def invalidate(self, key, client):
+        """Stop handing out a broken ``client``; it is closed once its last lease is released.
+
+        Executors still holding it keep their lease, so a failure seen by one thread does not
+        close the connection under another thread's in-flight command.
+        """
+        with self._lock:
+            if self._clients.get(key) is client:
+                del self._clients[key]
+            leased = client in self._leases
+            if not leased:
+                self._forget(client)
+        if not leased:
+            _close_quietly(client)
+
+    def facts(self, client, seed=None):
+        """Return the mutable per-connection cache of host facts (OS type, tool probes).
+
+        ``seed()`` supplies the initial facts the first time ``client`` is seen.
+        """
+        with self._lock:
+            facts = self._facts.get(client)
+            if facts is None:
+                facts = self._facts[client] = dict(seed() if seed else {})
+            return facts
+
+    def reap_idle(self):
+        """Close clients that are unleased and idle past ``idle_timeout`` or already dead."""
+        now = time.monotonic()
+        reaped = []
+        with self._lock:
+            for key, client in list(self._clients.items()):
+                if client in self._leases:
+                    continue
+                idle_for = now - self._idle_since.get(client, now)
+                if idle_for > self.idle_timeout or not is_alive(client):
+                    del self._clients[key]
+                    self._forget(client)
+                    reaped.append(client)
+        for client in reaped:
+            _close_quietly(client)
+        return len(reaped)
+
+    def close_all(self):
+        with self._lock:
+            clients = list(self._clients.values())
+            self._clients.clear()
+            self._leases.clear()
+            self._idle_since.clear()
+        for client in clients:
+            _close_quietly(client)
+
+    def _lease(self, client):
+        self._leases[client] = self._leases.get(client, 0) + 1
+        self._idle_since.pop(client, None)
+
+    def _forget(self, client):
+        self._leases.pop(client, None)
+        self._idle_since.pop(client, None)
+
+    def _trim(self):
+        """Evict least recently used idle clients beyond ``max_connections``; leased ones are kept."""
+        evicted = []
+        for key in list(self._clients):
+            if len(self._clients) <= self.max_connections:
+                break
+            client = self._clients[key]
+            if client in self._leases:
+                continue
+            del self._clients[key]
+            self._forget(client)
+            evicted.append(client)
+        return evicted
+
+    def _ensure_reaper(self):
+        with self._lock:
+            if self._reaper is not None:
+                return
+            self._reaper = threading.Thread(target=self._reap_forever, name="ssh-pool-reaper", daemon=True)
+            self._reaper.start()
+
+    def _reap_forever(self):
+        while True:
+            time.sleep(REAP_INTERVAL)
+            try:
+                self.reap_idle()
+            except Exception:
+                pass
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clients)
+
+
+pool = SSHConnectionPool()
+atexit.register(pool.close_all)
@@ -0,0 +1,88 @@
+"""Shared argument parsing, server selection and SSH setup for the manual test scripts."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence, Tuple
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+from Remote.remote_executor import RemoteExecutor
+from Remote.utilities.config_loader import index_servers, load_server_ini, load_yaml
+
+DEFAULT_SETTINGS = os.path.join(ROOT, "Remote", "config", "settings.yaml")
+DEFAULT_SERVERS = os.path.join(ROOT, "Remote", "config", "servers.ini")
+
+
+def build_parser(description: str) -> argparse.ArgumentParser:
+    """Parser with the --settings/--servers/--server options every script accepts."""
+    parser = argparse.ArgumentParser(description=description)
+    parser.add_argument("--settings", default=DEFAULT_SETTINGS, help="Path to settings.yaml")
+    parser.add_argument("--servers", default=DEFAULT_SERVERS, help="Path to servers.ini")
+    parser.add_argument(
+        "--server",
+        default=None,
+        help="Server name/host from servers.ini (defaults to first entry)",
+    )
+    return parser
+
+
+def pick_server(records: Sequence[Mapping[str, Any]], identifier: Optional[str]) -> Mapping[str, Any]:
+    if not records:
+        raise SystemExit("No servers defined in inventory")
+    if identifier is None:
+        return records[0]
+    record = index_servers(records).get(identifier.strip().lower())
+    if record is None:
+        raise SystemExit(f"Server '{identifier}' not found in inventory")
+    return record
+
+
+def load_target(args: argparse.Namespace) -> Tuple[Dict[str, Any], Mapping[str, Any]]:
+    """Return ``(settings, server)`` for the parsed --settings/--servers/--server options."""
+    settings = load_yaml(args.settings)
+    server = pick_server(load_server_ini(args.servers), args.server)
+    return settings, server
+
+
+def resolve_tomcat_home(
+    post_install_cfg: Dict[str, Any], stage_cfg: Dict[str, Any], override: Optional[str]
+) -> Optional[str]:
+    return override or post_install_cfg.get("default_tomcat_home") or stage_cfg.get("tomcat_home")
+
+
+def require_tomcat_home(
+    post_install_cfg: Dict[str, Any], stage_cfg: Dict[str, Any], override: Optional[str]
+) -> str:
+    candidate = resolve_tomcat_home(post_install_cfg, stage_cfg, override)
+    if not candidate:
+        raise SystemExit("Tomcat home must be provided via --tomcat-home or post_install defaults")
+    return candidate
+
+
+@contextmanager
+def connected_executor(server: Mapping[str, Any], label: str) -> Iterator[RemoteExecutor]:
+    """Announce the run, then yield a connected executor that is closed afterwards."""
+    print(f"Running {label} as {server.get('username')} on {server.get('host')}")
+
+    executor = RemoteExecutor(
+        host=server["host"],
+        username=server["username"],
+        password=server.get("password") or None,
+        key_path=server.get("key_path") or None,
+    )
+    executor.connect()
+    try:
+        yield executor
+    finally:
+        executor.close()
+
+
+def print_result(result: Dict[str, Any]) -> None:
+    print(json.dumps(result, indent=2))
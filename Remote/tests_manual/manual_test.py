@@ -0,0 +1,39 @@
+"""Single entry point for the manual test scripts: ``manual_test.py --tool NAME [script options]``."""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+
+# --tool value -> script module in this directory; only the chosen one is imported
+TOOLS = {
+    "disk": "disk_check",
+    "ram": "ram_check",
+    "port": "port_check",
+    "java": "java_install",
+    "install": "tomcat_install",
+    "uninstall": "tomcat_uninstall",
+    "start": "tomcat_start",
+    "stop": "tomcat_stop",
+    "validate": "tomcat_validate",
+    "post-install": "tomcat_post_install",
+}
+
+
+def main() -> None:
+    # No -h of its own, so "--tool NAME --help" shows that script's options
+    parser = argparse.ArgumentParser(
+        description="Run one manual tool test; remaining options go to that tool's script",
+        add_help=False,
+    )
+    parser.add_argument("--tool", required=True, choices=sorted(TOOLS), help="Tool to run")
+    args, remaining = parser.parse_known_args()
+
+    module = importlib.import_module(TOOLS[args.tool])
+    sys.argv = [module.__file__, *remaining]
+    module.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,65 +3,23 @@
 from __future__ import annotations
 
 import argparse
-import json
 
-import os
-import sys
+from _common import build_parser, connected_executor, load_target, print_result
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-sys.path.insert(0, ROOT)
-
-from Remote.utilities.config_loader import load_server_ini, load_yaml
-from Remote.remote_executor import RemoteExecutor
 from Remote.pre_install.remote_ram_check import RemoteRamCheckTool
 
-DEFAULT_SETTINGS = os.path.join(ROOT, "Remote", "config", "settings.yaml")
-DEFAULT_SERVERS = os.path.join(ROOT, "Remote", "config", "servers.ini")
-
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run remote RAM capacity check")
-    parser.add_argument("--settings", default=DEFAULT_SETTINGS, help="Path to settings.yaml")
-    parser.add_argument("--servers", default=DEFAULT_SERVERS, help="Path to servers.ini")
-    parser.add_argument(
-        "--server",
-        default=None,
-        help="Server name/host from servers.ini (defaults to first entry)",
-    )
+    parser = build_parser("Run remote RAM capacity check")
     parser.add_argument("--min-mb", type=int, default=None, help="Override minimum RAM threshold")
     return parser.parse_args()
 
 
-def pick_server(records, identifier):
-    if not records:
-        raise SystemExit("No servers defined in inventory")
-    if identifier is None:
-        return records[0]
-    ident = identifier.strip().lower()
-    for record in records:
-        if ident in {str(record.get("name", "")).lower(), str(record.get("host", "")).lower()}:
-            return record
-    raise SystemExit(f"Server '{identifier}' not found in inventory")
-
-
 def main() -> None:
     args = parse_args()
-    settings = load_yaml(args.settings)
-    servers = load_server_ini(args.servers)
-    server = pick_server(servers, args.server)
-
-    print(
-        f"Running remote_ram_check as {server.get('username')} on {server.get('host')}"
-    )
+    settings, server = load_target(args)
 
-    executor = RemoteExecutor(
-        host=server["host"],
-        username=server["username"],
-        password=server.get("password") or None,
-        key_path=server.get("key_path") or None,
-    )
-    executor.connect()
-    try:
+    with connected_executor(server, "remote_ram_check") as executor:
         tool = RemoteRamCheckTool()
         config = settings.get("pre_install", {}).get("ram_check", {})
         result = tool.run(
@@ -69,9 +27,7 @@ def main() -> None:
             config=config,
             min_mb=args.min_mb,
         )
-        print(json.dumps(result, indent=2))
-    finally:
-        executor.close()
+        print_result(result)
 
 
 if __name__ == "__main__":
@@ -3,32 +3,19 @@
 from __future__ import annotations
 
 import argparse
-import json
-import os
-import sys
 from typing import Any, Dict
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
+from _common import build_parser, connected_executor, load_target, print_result
 
-from Remote.utilities.config_loader import load_server_ini, load_yaml
-from Remote.remote_executor import RemoteExecutor
 from Remote.post_install import (
     RemoteTomcatStartTool,
     RemoteTomcatValidationTool,
     RemoteTomcatStopTool,
 )
 
-DEFAULT_SETTINGS = os.path.join(ROOT, "Remote", "config", "settings.yaml")
-DEFAULT_SERVERS = os.path.join(ROOT, "Remote", "config", "servers.ini")
-
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Run Tomcat post-install stages remotely")
-    parser.add_argument("--settings", default=DEFAULT_SETTINGS, help="Path to settings.yaml")
-    parser.add_argument("--servers", default=DEFAULT_SERVERS, help="Path to servers.ini")
-    parser.add_argument("--server", default=None, help="Server name/host from servers.ini (defaults to first entry)")
+    parser = build_parser("Run Tomcat post-install stages remotely")
     parser.add_argument("--tomcat-home", default=None, help="Override Tomcat home directory")
     parser.add_argument("--skip-start", action="store_true", help="Skip running the start command")
     parser.add_argument("--skip-stop", action="store_true", help="Skip running the stop command")
@@ -38,27 +25,9 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def pick_server(records, identifier):
-    if not records:
-        raise SystemExit("No servers defined in inventory")
-    if identifier is None:
-        return records[0]
-    ident = identifier.strip().lower()
-    for record in records:
-        if ident in {str(record.get("name", "")).lower(), str(record.get("host", "")).lower()}:
-            return record
-    raise SystemExit(f"Server '{identifier}' not found in inventory")
-
-
 def main() -> None:
     args = parse_args()
-    settings = load_yaml(args.settings)
-    servers = load_server_ini(args.servers)
-    server = pick_server(servers, args.server)
-
-    print(
-        f"Running Tomcat post-install stages as {server.get('username')} on {server.get('host')}"
-    )
+    settings, server = load_target(args)
 
     post_install = settings.get("post_install", {})
     start_cfg = post_install.get("tomcat_start", {})
@@ -83,14 +52,7 @@ def main() -> None:
     if args.host_template is not None:
         validation_cfg = {**validation_cfg, "host_template": args.host_template}
 
-    executor = RemoteExecutor(
-        host=server["host"],
-        username=server["username"],
-        password=server.get("password") or None,
-        key_path=server.get("key_path") or None,
-    )
-    executor.connect()
-    try:
+    with connected_executor(server, "Tomcat post-install stages") as executor:
         results: Dict[str, Any] = {}
         if not args.skip_start and start_cfg:
             start_tool = RemoteTomcatStartTool()
@@ -116,9 +78,7 @@ def main() -> None:
                 tomcat_home=tomcat_home,
             )
 
-        print(json.dumps(results, indent=2))
-    finally:
-        executor.close()
+        print_result(results)
 
 
 if __name__ == "__main__":
@@ -3,28 +3,14 @@
 from __future__ import annotations
 
 import argparse
-import json
-import os
-import sys
-from typing import Any, Dict
 
-ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
-if ROOT not in sys.path:
-    sys.path.insert(0, ROOT)
+from _common import build_parser, connected_executor, load_target, print_result, resolve_tomcat_home
 
-from Remote.utilities.config_loader import load_server_ini, load_yaml
-from Remote.remote_executor import RemoteExecutor
 from Remote.post_install import RemoteTomcatValidationTool
 
-DEFAULT_SETTINGS = os.path.join(ROOT, "Remote", "config", "settings.yaml")
-DEFAULT_SERVERS = os.path.join(ROOT, "Remote", "config", "servers.ini")
-
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Validate remote Tomcat over HTTP")
-    parser.add_argument("--settings", default=DEFAULT_SETTINGS, help="Path to settings.yaml")
-    parser.add_argument("--servers", default=DEFAULT_SERVERS, help="Path to servers.ini")
-    parser.add_argument("--server", default=None, help="Server name/host from servers.ini (defaults to first entry)")
+    parser = build_parser("Validate remote Tomcat over HTTP")
     parser.add_argument("--tomcat-home", default=None, help="Optional Tomcat home directory for metadata")
     parser.add_argument("--wait-seconds", type=int, default=None, help="Override wait_seconds before HTTP timeout")
     parser.add_argument("--port", type=int, default=None, help="Override HTTP port")
@@ -32,35 +18,9 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def pick_server(records, identifier):
-    if not records:
-        raise SystemExit("No servers defined in inventory")
-    if identifier is None:
-        return records[0]
-    ident = identifier.strip().lower()
-    for record in records:
-        if ident in {str(record.get("name", "")).lower(), str(record.get("host", "")).lower()}:
-            return record
-    raise SystemExit(f"Server '{identifier}' not found in inventory")
-
-
-def resolve_tomcat_home(post_install_cfg: Dict[str, Any], validation_cfg: Dict[str, Any], override: str | None) -> str | None:
-    return (
-        override
-        or post_install_cfg.get("default_tomcat_home")
-        or validation_cfg.get("tomcat_home")
-    )
-
-
 def main() -> None:
     args = parse_args()
-    settings = load_yaml(args.settings)
-    servers = load_server_ini(args.servers)
-    server = pick_server(servers, args.server)
-
-    print(
-        f"Running remote_tomcat_validation as {server.get('username')} on {server.get('host')}"
-    )
+    settings, server = load_target(args)
 
     post_install_cfg = settings.get("post_install", {})
     validation_cfg = post_install_cfg.get("tomcat_validation", {})
@@ -74,14 +34,7 @@ def main() -> None:
 
     tomcat_home = resolve_tomcat_home(post_install_cfg, validation_cfg, args.tomcat_home)
 
-    executor = RemoteExecutor(
-        host=server["host"],
-        username=server["username"],
-        password=server.get("password") or None,
-        key_path=server.get("key_path") or None,
-    )
-    executor.connect()
-    try:
+    with connected_executor(server, "remote_tomcat_validation") as executor:
         tool = RemoteTomcatValidationTool()
         result = tool.run(
             executor=executor,
@@ -89,9 +42,7 @@ def main() -> None:
             server=server,
             tomcat_home=tomcat_home,
         )
-        print(json.dumps(result, indent=2))
-    finally:
-        executor.close()
+        print_result(result)
 
 
 if __name__ == "__main__":
@@ -1,4 +1,63 @@
-from typing import Dict, Any, Tuple
+import copy
+import io
+from typing import Dict, Any, Iterable, List, Tuple
+
+
+class LogBuffer:
+    """Newline-joined log accumulator that drops empty entries as they arrive."""
+
+    def __init__(self) -> None:
+        self._buffer = io.StringIO()
+
+    def append(self, line: str | None) -> None:
+        if line:
+            if self._buffer.tell():
+                self._buffer.write("\n")
+            self._buffer.write(line)
+
+    def getvalue(self) -> str:
+        return self._buffer.getvalue()
+
+    def extend_stream(self, pairs: Iterable[Tuple[str, str]]) -> Tuple[List[str], List[str]]:
+        """Log ``RemoteExecutor.run_stream`` lines as they arrive; return (stdout, stderr) lines."""
+        out_lines: List[str] = []
+        err_lines: List[str] = []
+        for stream, line in pairs:
+            line = line.strip()
+            if not line:
+                continue
+            if stream == "stderr":
+                err_lines.append(line)
+                self.append(f"stderr: {line}")
+            else:
+                out_lines.append(line)
+                self.append(line)
+        return out_lines, err_lines
+
+
+class _FrozenDict(dict):
+    """``dict`` that rejects mutation; still a dict, so ``json.dumps`` and ``dict(...)`` work."""
+
+    __slots__ = ()
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        # copy.deepcopy/pickle rebuild from the items instead of replaying __setitem__
+        return type(self), (dict(self),)
+
+
+def _freeze(value: Any) -> Any:
+    """Deep-copy ``value`` with every dict made a ``_FrozenDict`` and every list a tuple."""
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return copy.deepcopy(value)
 
 
 class RemoteTool:
@@ -7,6 +66,10 @@ class RemoteTool:
     # Default configuration scope within settings.yaml (e.g., ("pre_install", "java"))
     config_path: Tuple[str, ...] = ()
 
+    # Subclasses declare their own __slots__ (even empty) so instances carry no __dict__;
+    # config_path and command templates stay class attributes shared by every instance
+    __slots__ = ("name", "description", "parameters", "user_parameters", "_info")
+
     def __init__(
         self,
         name: str,
@@ -18,19 +81,24 @@ class RemoteTool:
         self.description = description
         self.parameters = parameters
         self.user_parameters = user_parameters or {}
+        # Tool metadata is fixed once constructed: deep-copy and freeze it once, so every
+        # call shares one JSON-ready dict that callers cannot change
+        self._info: Dict[str, Any] = _freeze(
+            {
+                "toolName": name,
+                "description": description,
+                "parameters": self.user_parameters or parameters,
+            }
+        )
 
     def get_info(self) -> Dict[str, Any]:
-        return {
-            "toolName": self.name,
-            "description": self.description,
-            "parameters": self.user_parameters or self.parameters,
-        }
+        return self._info
 
     def get_config_path(self) -> Tuple[str, ...]:
         return self.config_path
 
     def get_user_parameters(self) -> Dict[str, Any]:
-        return self.user_parameters or self.parameters
+        return self._info["parameters"]
 
     def run(self, *args, **kwargs):
         raise NotImplementedError("Remote tools must implement run()")
@@ -0,0 +1,71 @@
+"""Render settings.yaml into an importable Python module so CLI runs skip YAML parsing.
+
+Usage (from the repository root)::
+
+    python -m Remote.utilities.compile_settings [--settings Remote/config/settings.yaml]
+
+The module records the source file's mtime and size; ``load_yaml`` only uses it while
+those still match, so editing settings.yaml without recompiling is safe.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import os
+import pprint
+import sys
+import threading
+
+from Remote.utilities.config_loader import SETTINGS_PATH, _parse_yaml
+
+OUTPUT_PATH = os.path.join(os.path.dirname(SETTINGS_PATH), "_settings_generated.py")
+
+_TEMPLATE = '''"""Generated from settings.yaml by Remote.utilities.compile_settings; do not edit."""
+
+SOURCE_STAMP = {stamp!r}
+
+SETTINGS = {settings}
+'''
+
+
+def compile_settings(settings_path: str = SETTINGS_PATH, output_path: str = OUTPUT_PATH) -> str:
+    """Write the generated module for ``settings_path`` and return its path."""
+    info = os.stat(settings_path)
+    data = _parse_yaml(settings_path)
+    rendered = pprint.pformat(data, indent=4, width=100, sort_dicts=False)
+    # Only plain literals round-trip; YAML timestamps and the like keep the runtime parse
+    try:
+        faithful = ast.literal_eval(rendered) == data
+    except (ValueError, SyntaxError):
+        faithful = False
+    if not faithful:
+        raise ValueError(f"{settings_path} contains values that cannot be written as Python literals")
+
+    source = _TEMPLATE.format(stamp=(info.st_mtime_ns, info.st_size), settings=rendered)
+    tmp_path = f"{output_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as fh:
+        fh.write(source)
+    os.replace(tmp_path, output_path)
+    return output_path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pre-compile settings.yaml into a Python module")
+    parser.add_argument("--settings", default=SETTINGS_PATH, help="Path to settings.yaml")
+    parser.add_argument("--output", default=OUTPUT_PATH, help="Path of the generated module")
+    args = parser.parse_args()
+
+    if os.path.abspath(args.settings) != SETTINGS_PATH:
+        print("Note: load_yaml only uses the generated module for the repository's settings.yaml", file=sys.stderr)
+    try:
+        output = compile_settings(args.settings, args.output)
+    except (OSError, ValueError) as exc:
+        print(f"Error: {exc}", file=sys.stderr)
+        return 1
+    print(f"Wrote {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,35 +1,137 @@
 import configparser
+import copy
+import functools
+import hashlib
+import importlib
+import json
 import os
-from typing import Any, Dict, Iterable, List
+import stat
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 
 import yaml
 
+from Remote.host_cache import STATE_DIR
+
+try:
+    # LibYAML-backed loader, bundled with the PyYAML wheels on common platforms
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - PyYAML built without libyaml
+    from yaml import SafeLoader as _SafeLoader
+
+# Parsed YAML files as JSON, so a fresh process can skip the YAML parse
+CONFIG_CACHE_DIR = os.path.join(STATE_DIR, "config")
+_REQUIRED_SERVER_FIELDS = ("host", "username")
+
+# settings.yaml pre-rendered as a Python literal by Remote.utilities.compile_settings
+SETTINGS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "config", "settings.yaml")
+GENERATED_SETTINGS_MODULE = "Remote.config._settings_generated"
+
 
 def load_yaml(path: str) -> Dict[str, Any]:
-    if not os.path.isfile(path):
+    """Parse ``path`` once per (mtime, size) and return a copy the caller may change freely."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        info = None
+    if info is None or not stat.S_ISREG(info.st_mode):
         raise FileNotFoundError(f"YAML configuration not found: {path}")
+    return copy.deepcopy(_load_yaml_cached(path, info.st_mtime_ns, info.st_size))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_yaml_cached(path: str, mtime: int, size: int) -> Dict[str, Any]:
+    generated = _generated_settings(path, mtime, size)
+    if generated is not None:
+        return generated
+    return _disk_cached(path, mtime, size, lambda: _parse_yaml(path))
+
+
+def _generated_settings(path: str, mtime: int, size: int) -> Optional[Dict[str, Any]]:
+    """Return the compiled settings module's data when it was built from this exact file."""
+    if os.path.abspath(path) != SETTINGS_PATH:
+        return None
+    try:
+        module = importlib.import_module(GENERATED_SETTINGS_MODULE)
+    except ImportError:
+        return None
+    if getattr(module, "SOURCE_STAMP", None) != (mtime, size):
+        return None
+    return module.SETTINGS
+
+
+def _parse_yaml(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as fh:
-        return yaml.safe_load(fh) or {}
+        return yaml.load(fh, Loader=_SafeLoader) or {}
+
 
+def _disk_cached(path: str, mtime: int, size: int, parse: Callable[[], Any]) -> Any:
+    """Return ``parse()``'s result, reusing the on-disk copy written for this (mtime, size)."""
+    cache_path = _disk_cache_path(path)
+    stamp = [mtime, size]
+    try:
+        with open(cache_path, "r", encoding="utf-8") as fh:
+            entry = json.load(fh)
+        if entry.get("stamp") == stamp:
+            return entry["data"]
+    except (OSError, ValueError, KeyError, AttributeError):
+        pass
 
-def load_server_ini(path: str) -> List[Dict[str, Any]]:
-    if not os.path.isfile(path):
+    data = parse()
+    try:
+        payload = json.dumps({"stamp": stamp, "data": data})
+        # Skip values JSON cannot represent faithfully (YAML dates, non-string keys)
+        if json.loads(payload)["data"] == data:
+            os.makedirs(CONFIG_CACHE_DIR, exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as fh:
+                fh.write(payload)
+            os.replace(tmp_path, cache_path)
+    except (OSError, TypeError, ValueError):
+        pass
+    return data
+
+
+def _disk_cache_path(path: str) -> str:
+    digest = hashlib.blake2b(os.path.abspath(path).encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(CONFIG_CACHE_DIR, f"{digest}.json")
+
+
+def load_server_ini(path: str) -> Tuple[Mapping[str, Any], ...]:
+    """Parse ``path`` once per (mtime, size) into read-only records shared by every caller.
+
+    Copy a record with ``dict(record)`` before changing it.
+    """
+    try:
+        info = os.stat(path)
+    except OSError:
+        info = None
+    if info is None or not stat.S_ISREG(info.st_mode):
         raise FileNotFoundError(f"Server INI file not found: {path}")
+    return _load_server_ini_cached(path, info.st_mtime_ns, info.st_size)
 
-    parser = configparser.ConfigParser()
+
+@functools.lru_cache(maxsize=8)
+def _load_server_ini_cached(path: str, mtime: int, size: int) -> Tuple[Mapping[str, Any], ...]:
+    # Inventories hold credentials, so unlike settings they are only cached in memory
+    return tuple(MappingProxyType(record) for record in _parse_server_ini(path))
+
+
+def _parse_server_ini(path: str) -> List[Dict[str, Any]]:
+    # Inventories use no %(name)s references; raw parsing also keeps a literal "%" in a password
+    parser = configparser.RawConfigParser()
     parser.read(path, encoding="utf-8")
 
-    defaults = {k: v for k, v in parser.items("defaults")} if parser.has_section("defaults") else {}
+    defaults = dict(parser["defaults"]) if parser.has_section("defaults") else {}
 
     servers: List[Dict[str, Any]] = []
     for section in parser.sections():
         if section.lower() == "defaults":
             continue
-        data = defaults.copy()
-        data.update({k: v for k, v in parser.items(section)})
+        data = {**defaults, **parser[section]}
         data.setdefault("name", section)
-        required = ["host", "username"]
-        missing = [field for field in required if not data.get(field)]
+        missing = [field for field in _REQUIRED_SERVER_FIELDS if not data.get(field)]
         if missing:
             raise ValueError(f"Section '{section}' missing required fields: {', '.join(missing)}")
         servers.append(data)
@@ -37,22 +139,31 @@ def load_server_ini(path: str) -> List[Dict[str, Any]]:
     return servers
 
 
+def index_servers(records: Iterable[Mapping[str, Any]]) -> Dict[str, Mapping[str, Any]]:
+    """Map each record's lower-cased name and host to it; the first record wins on clashes."""
+    index: Dict[str, Mapping[str, Any]] = {}
+    for record in records:
+        index.setdefault(str(record.get("name", "")).strip().lower(), record)
+        index.setdefault(str(record.get("host", "")).strip().lower(), record)
+    return index
+
+
 def merge_dict(base: Dict[str, Any], overrides: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
-    result = base.copy()
-    for layer in overrides:
-        result = _deep_merge(result, layer)
+    """Deep-merge ``overrides`` onto ``base`` in order, without modifying any input."""
+    result: Dict[str, Any] = {}
+    for layer in (base, *overrides):
+        _deep_merge_into(result, layer)
     return result
 
 
-def _deep_merge(base: Dict[str, Any], overrides: Dict[str, Any]) -> Dict[str, Any]:
-    merged: Dict[str, Any] = base.copy()
+def _deep_merge_into(target: Dict[str, Any], overrides: Dict[str, Any]) -> None:
+    # Nested dicts are copied into ``target`` as they are first seen, so later layers
+    # merge in place without touching the caller's dicts; leaf values are shared
     for key, value in overrides.items():
-        if (
-            key in merged
-            and isinstance(merged[key], dict)
-            and isinstance(value, dict)
-        ):
-            merged[key] = _deep_merge(merged[key], value)
+        if isinstance(value, dict):
+            current = target.get(key)
+            if not isinstance(current, dict):
+                current = target[key] = {}
+            _deep_merge_into(current, value)
         else:
-            merged[key] = value
-    return merged
+            target[key] = value
@@ -1,4 +1,11 @@
-from typing import Dict, Any, Optional, TYPE_CHECKING
+import hashlib
+import os
+import re
+import shlex
+import threading
+from typing import Dict, Any, Optional, Tuple, TYPE_CHECKING
+
+import requests
 
 from Remote.tool_base import RemoteTool
 
@@ -6,6 +13,9 @@ if TYPE_CHECKING:  # pragma: no cover - only for typing
     from Remote.remote_executor import RemoteExecutor
 
 
+_PS_TRANS = str.maketrans({"'": "''"})
+
+
 def _to_ps_literal(path: str) -> str:
     """Return a PowerShell-friendly literal or expression for a remote path."""
     trimmed = path.strip()
@@ -17,16 +27,54 @@ def _to_ps_literal(path: str) -> str:
             return trimmed
         expr = parts[0]
         for segment in parts[1:]:
-            escaped_segment = segment.replace("'", "''")
-            expr = f"(Join-Path {expr} '{escaped_segment}')"
+            expr = "(Join-Path " + expr + " '" + segment.translate(_PS_TRANS) + "')"
         return expr
-    escaped = trimmed.replace("'", "''")
-    return f"'{escaped}'"
+    return "'" + trimmed.translate(_PS_TRANS) + "'"
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _linux_fetch_command(
+    download_url: str,
+    archive_path: str,
+    expected_sha256: Optional[str],
+    connections: int = 8,
+) -> str:
+    """Bash fragment that downloads ``download_url`` to ``archive_path``, reusing a verified archive."""
+    fetch = f"wget -O {archive_path} {download_url}"
+    if connections > 1:
+        # Segmented download when aria2c is installed, probed inline to avoid a round-trip
+        fetch = (
+            "if command -v aria2c >/dev/null 2>&1; then "
+            f"aria2c -q -x {connections} -s {connections} --allow-overwrite=true "
+            f"-d \"$(dirname {archive_path})\" -o \"$(basename {archive_path})\" {download_url}; "
+            f"else {fetch}; fi"
+        )
+    expected = (expected_sha256 or "").strip().lower()
+    if not expected:
+        return fetch
+
+    # Reuse an archive whose sidecar (or on-disk digest) matches; record it after a fresh download
+    digest = shlex.quote(expected)
+    verify = f"printf '%s  %s\\n' {digest} {archive_path} | sha256sum -c --status"
+    cached = f"[ -f {archive_path} ] && {{ [ \"$(cat {archive_path}.sha256 2>/dev/null)\" = {digest} ] || {verify}; }}"
+    return (
+        f"{{ {cached} && echo 'Cache hit: existing archive matches expected SHA-256, skipping download'; }}"
+        f" || {{ {fetch} && {verify} && echo {digest} > {archive_path}.sha256; }}"
+    )
 
 
 class RemoteCurlDownloadTool(RemoteTool):
     """Download a file on a remote host using curl.exe via PowerShell."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="remote_curl_download",
@@ -36,6 +84,9 @@ class RemoteCurlDownloadTool(RemoteTool):
                 "url": "HTTPS/HTTP URL to download",
                 "destination": "Remote path for downloaded file",
                 "min_size": "Minimum expected size for validation",
+                "expected_sha256": "Optional SHA-256 digest; reuses a matching archive",
+                "etag_cache": "Send ETag conditional requests for existing archives",
+                "download_cache": "Local cache directory; fetch once here and upload over SFTP",
             },
         )
 
@@ -46,36 +97,85 @@ class RemoteCurlDownloadTool(RemoteTool):
         destination: str,
         min_size: int = 1024,
         extra_args: Optional[str] = None,
+        expected_sha256: Optional[str] = None,
+        etag_cache: bool = False,
+        download_cache: Optional[str] = None,
     ) -> Dict[str, Any]:
         logs = []
         try:
             dest_literal = _to_ps_literal(destination)
-            args_segment = f" {extra_args.strip()}" if extra_args else ""
-            url_literal = url.replace("'", "''")
-            curl_cmd_parts = [
-                "powershell -Command \"",
-                f"$destination = {dest_literal};",
-                f"$url = '{url_literal}';",
-                f"curl.exe -L $url -o $destination{args_segment};",
-                "\"",
-            ]
-            curl_cmd = "".join(curl_cmd_parts)
-            out, err = executor.run(curl_cmd)
-            if out.strip():
-                logs.append(out.strip())
-            if err.strip():
-                logs.append(err.strip())
+            expected = (expected_sha256 or "").strip().lower()
+            if expected and self._cached_digest(executor, dest_literal) == expected:
+                logs.append("Cache hit: existing archive matches expected SHA-256, skipping download")
+                return {
+                    "name": self.name,
+                    "status": "Success",
+                    "command": "Get-FileHash",
+                    "output": "",
+                    "details": "\n".join(logs),
+                    "metadata": {
+                        "destination": destination,
+                        "sha256": expected,
+                        "cached": True,
+                    },
+                }
 
+            if download_cache:
+                local_path, hit = self._fetch_to_cache(url, expected, download_cache)
+                logs.append(f"{'Using cached' if hit else 'Cached'} download {local_path}")
+                remote_path = self._resolve_remote_path(executor, dest_literal)
+                executor.upload(local_path, remote_path)
+                logs.append(f"Uploaded archive to {remote_path} over SFTP")
+                out, err = "", ""
+            else:
+                args_segment = f" {extra_args.strip()}" if extra_args else ""
+                url_literal = url.replace("'", "''")
+                etag_segment = ""
+                if etag_cache:
+                    # Conditional GET: curl leaves the existing file untouched on HTTP 304
+                    etag_segment = (
+                        "$etag = $destination + '.etag';"
+                        "$etagArgs = @('--etag-save', $etag);"
+                        "if ((Test-Path $destination) -and (Test-Path $etag)) { $etagArgs += @('--etag-compare', $etag) };"
+                    )
+                    args_segment = f" @etagArgs{args_segment}"
+                curl_cmd_parts = [
+                    "powershell -Command \"",
+                    f"$destination = {dest_literal};",
+                    f"$url = '{url_literal}';",
+                    etag_segment,
+                    f"curl.exe -L $url -o $destination{args_segment};",
+                    "\"",
+                ]
+                curl_cmd = "".join(curl_cmd_parts)
+                out, err = executor.run(curl_cmd)
+                if out.strip():
+                    logs.append(out.strip())
+                if err.strip():
+                    logs.append(err.strip())
+
+            hash_segment = ""
+            if expected:
+                # Verify and record the digest in the same round-trip as the size check
+                expected_literal = expected.replace("'", "''")
+                hash_segment = (
+                    "$hash = (Get-FileHash $destination -Algorithm SHA256 -ErrorAction SilentlyContinue).Hash;"
+                    f"if ($hash -eq '{expected_literal}') {{ Set-Content -Path ($destination + '.sha256') -Value $hash -NoNewline }};"
+                    "$hash"
+                )
             size_cmd = (
                 "powershell -Command \""
                 f"$destination = {dest_literal};"
-                "(Get-Item $destination -ErrorAction SilentlyContinue).Length"
+                "(Get-Item $destination -ErrorAction SilentlyContinue).Length;"
+                f"{hash_segment}"
                 "\""
             )
             size_out, size_err = executor.run(size_cmd)
             if size_err.strip():
                 logs.append(size_err.strip())
-            size_value = size_out.strip()
+            size_lines = size_out.strip().splitlines() or [""]
+            size_value = size_lines[0].strip()
+            digest = size_lines[-1].strip().lower() if expected and len(size_lines) > 1 else ""
 
             status = "Failed"
             if size_value.isdigit() and int(size_value) >= max(min_size, 0):
@@ -86,15 +186,24 @@ class RemoteCurlDownloadTool(RemoteTool):
                     f"Expected at least {max(min_size, 0)} bytes but got '{size_value}'."
                 )
 
+            if expected and status == "Success":
+                if digest == expected:
+                    logs.append("SHA-256 checksum verified")
+                else:
+                    status = "Failed"
+                    logs.append(f"SHA-256 mismatch: expected {expected} but got '{digest}'.")
+
             return {
                 "name": self.name,
                 "status": status,
-                "command": "curl.exe",
+                "command": "sftp" if download_cache else "curl.exe",
                 "output": out + err,
                 "details": "\n".join(logs),
                 "metadata": {
                     "destination": destination,
                     "size": size_value,
+                    "sha256": digest,
+                    "cached": False,
                 },
             }
         except Exception as exc:  # pragma: no cover - defensive
@@ -106,3 +215,56 @@ class RemoteCurlDownloadTool(RemoteTool):
                 "output": "",
                 "details": "\n".join(logs),
             }
+
+    def _fetch_to_cache(self, url: str, expected: str, cache_dir: str) -> Tuple[str, bool]:
+        """Return ``(local_path, hit)`` for ``url``, downloading into ``cache_dir`` on a miss."""
+        cache_root = os.path.expanduser(cache_dir)
+        os.makedirs(cache_root, exist_ok=True)
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        if expected:
+            key = f"{key}-{expected}"
+        path = os.path.join(cache_root, key)
+        if os.path.exists(path) and (not expected or _file_sha256(path) == expected):
+            return path, True
+
+        # Per-thread name so parallel installs fetching the same URL never share a temp file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        digest = hashlib.sha256()
+        try:
+            with requests.get(url, stream=True, timeout=(10, 60)) as response:
+                response.raise_for_status()
+                with open(tmp_path, "wb") as handle:
+                    for chunk in response.iter_content(chunk_size=1 << 20):
+                        handle.write(chunk)
+                        digest.update(chunk)
+            if expected and digest.hexdigest() != expected:
+                raise ValueError(f"SHA-256 mismatch for {url}: got {digest.hexdigest()}")
+            # Atomic publish so concurrent runs never upload a partial file
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return path, False
+
+    def _resolve_remote_path(self, executor: "RemoteExecutor", dest_literal: str) -> str:
+        """Expand ``$env:`` expressions remotely and convert to an SFTP path (``/C:/...``)."""
+        out, _ = executor.run(f"powershell -NoProfile -Command \"{dest_literal}\"")
+        path = (out.strip() or dest_literal.strip("'")).replace("\\", "/")
+        if re.match(r"^[A-Za-z]:", path):
+            path = "/" + path
+        return path
+
+    def _cached_digest(self, executor: "RemoteExecutor", dest_literal: str) -> str:
+        """Return the recorded (or freshly computed) SHA-256 of an existing archive."""
+        command = (
+            "powershell -Command \""
+            f"$destination = {dest_literal};"
+            "$sidecar = $destination + '.sha256';"
+            "if (Test-Path $destination) {"
+            "  if (Test-Path $sidecar) { (Get-Content $sidecar -Raw).Trim() }"
+            "  else { (Get-FileHash $destination -Algorithm SHA256).Hash }"
+            "}"
+            "\""
+        )
+        out, _ = executor.run(command)
+        return out.strip().lower()
@@ -1,3 +1,4 @@
+import re
 from typing import Dict, Any, Optional, TYPE_CHECKING
 
 from Remote.tool_base import RemoteTool
@@ -11,9 +12,21 @@ except ImportError:  # pragma: no cover - top-level script fallback
     from remote_download import _to_ps_literal  # type: ignore
 
 
+_REGEX_META = re.compile(r"[.*+?(){}\[\]|\\^$]")
+
+
+def _literal_prefix(pattern: str) -> Optional[str]:
+    """Return the literal for a plain anchored pattern such as ``^apache-tomcat-``, else None."""
+    if pattern.startswith("^") and len(pattern) > 1 and not _REGEX_META.search(pattern, 1):
+        return pattern[1:]
+    return None
+
+
 class RemoteZipExtractTool(RemoteTool):
     """Extract ZIP archives remotely and optionally resolve the top-level folder."""
 
+    __slots__ = ()
+
     def __init__(self) -> None:
         super().__init__(
             name="remote_zip_extract",
@@ -54,13 +67,22 @@ class RemoteZipExtractTool(RemoteTool):
 
             folder_name = ""
             if folder_pattern is not None:
-                pattern_literal = folder_pattern.replace("'", "''")
+                prefix = _literal_prefix(folder_pattern)
+                if prefix is not None:
+                    # Plain prefix: let the filesystem filter instead of regex-matching every entry
+                    filter_literal = _to_ps_literal(prefix + "*")
+                    list_segment = f"$dirs = Get-ChildItem -Path $destination -Directory -Filter {filter_literal};"
+                else:
+                    pattern_literal = folder_pattern.replace("'", "''")
+                    list_segment = (
+                        f"$pattern = '{pattern_literal}';"
+                        "$dirs = Get-ChildItem -Path $destination -Directory;"
+                        "if ($pattern) { $dirs = $dirs | Where-Object { $_.Name -match $pattern }; }"
+                    )
                 detect_cmd = (
                     "powershell -Command \""
                     f"$destination = {destination_literal};"
-                    f"$pattern = '{pattern_literal}';"
-                    "$dirs = Get-ChildItem -Path $destination -Directory;"
-                    "if ($pattern) { $dirs = $dirs | Where-Object { $_.Name -match $pattern }; }"
+                    f"{list_segment}"
                     "$match = $dirs | Sort-Object LastWriteTime -Descending | Select-Object -First 1;"
                     "if ($match) { $match.Name }"
                     "\""
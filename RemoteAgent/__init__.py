@@ -1,5 +1,12 @@
 """RemoteAgent package exposes the LangChain-based remote workflow chatbot."""
 
-from .chatbot import RemoteWorkflowChatBot
-
 __all__ = ["RemoteWorkflowChatBot"]
+
+
+def __getattr__(name):
+    # Deferred so importing a submodule (e.g. inventory_tool) does not load LangChain
+    if name == "RemoteWorkflowChatBot":
+        from .chatbot import RemoteWorkflowChatBot
+
+        return RemoteWorkflowChatBot
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
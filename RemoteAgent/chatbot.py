@@ -6,8 +6,9 @@ import inspect
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Sequence
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
 
 from langchain_core.messages import AIMessage, BaseMessage, HumanMessage
 from langchain_core.output_parsers import StrOutputParser
@@ -15,24 +16,24 @@ from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 from langchain_core.runnables import Runnable, RunnableLambda
 from langchain_ollama import ChatOllama
 
-from Remote.install.remote_tomcat_install import RemoteTomcatInstallTool
-from Remote.install.remote_tomcat_uninstall import RemoteTomcatUninstallTool
-from Remote.post_install.tomcat_start import RemoteTomcatStartTool
-from Remote.post_install.tomcat_stop import RemoteTomcatStopTool
-from Remote.post_install.tomcat_validation import RemoteTomcatValidationTool
-from Remote.pre_install.remote_disk_check import RemoteDiskCheckTool
-from Remote.pre_install.remote_java_install import RemoteJavaInstallTool
-from Remote.pre_install.remote_port_check import RemotePortCheckTool
-from Remote.pre_install.remote_ram_check import RemoteRamCheckTool
-from Remote.remote_executor import RemoteExecutor
-from Remote.utilities.config_loader import load_server_ini, load_yaml
+from Remote.utilities.config_loader import index_servers, load_server_ini, load_yaml
 from RemoteAgent.inventory_tool import ServerInventoryTool
-from Tools.remote_workflow_tool import RemoteWorkflowTool
+
+if TYPE_CHECKING:
+    from Tools.remote_workflow_tool import RemoteWorkflowTool
+
+# The remote tools (and paramiko behind them) are imported where the adapters are
+# built, so importing this module for its constants or help text stays cheap
 
 DEFAULT_SETTINGS_PATH = "Remote/config/settings.yaml"
 DEFAULT_SERVERS_PATH = "Remote/config/servers.ini"
 MAX_HISTORY_MESSAGES = 12
 MAX_SELECTION_ATTEMPTS = 3
+MAX_PARALLEL_TARGETS = 32
+
+# Tool parameters that override the inventory's connection settings
+_CONNECTION_OVERRIDES = ("host", "username", "password", "key_path")
+
 ALL_KEYWORDS = ("all", "every", "entire", "both")
 LOG_FILE = Path("logs/remote_chatbot.log")
 KEYWORD_TOOL_SEQUENCES = [
@@ -63,6 +64,23 @@ KEYWORD_TOOL_SEQUENCES = [
 ]
 
 
+# servers path -> (records, index) for the last records tuple load_server_ini returned
+_server_indexes: Dict[str, Tuple[Sequence[Mapping[str, Any]], Dict[str, Mapping[str, Any]]]] = {}
+
+
+def _cached_servers(path: str) -> Tuple[Sequence[Mapping[str, Any]], Dict[str, Mapping[str, Any]]]:
+    """Server records and their name/host index.
+
+    load_server_ini already memoizes per file mtime and returns the same tuple until the
+    file changes, so the index is rebuilt only when that tuple's identity changes.
+    """
+    records = load_server_ini(path)
+    cached = _server_indexes.get(path)
+    if cached is None or cached[0] is not records:
+        cached = _server_indexes[path] = (records, index_servers(records))
+    return cached
+
+
 class RemoteWorkflowChatBot:
     """Conversational agent that lets the LLM build per-request tool workflows."""
 
@@ -80,7 +98,11 @@ class RemoteWorkflowChatBot:
     ) -> None:
         self.settings_path = settings_path
         self.servers_path = servers_path
-        self.workflow_tool = workflow_tool or RemoteWorkflowTool()
+        if workflow_tool is None:
+            from Tools.remote_workflow_tool import RemoteWorkflowTool
+
+            workflow_tool = RemoteWorkflowTool()
+        self.workflow_tool = workflow_tool
         raw_llm = llm_client or ChatOllama(
             model=model_name,
             base_url="http://localhost:11434",
@@ -97,6 +119,8 @@ class RemoteWorkflowChatBot:
 
         self._logger = self._configure_logger(log_path)
         self._adapters = self._build_tool_adapters()
+        # Tool names and descriptions are fixed once the adapters exist
+        self._tool_reference = self._tool_reference_text()
         self._selection_chain = self._build_selection_chain()
         self._planner_chain = self._build_planner_chain()
         self._summary_chain = self._build_summary_chain()
@@ -195,7 +219,7 @@ class RemoteWorkflowChatBot:
             "history": self._history_tail(),
             "request": request,
             "selected_servers": ", ".join(identifiers),
-            "tool_reference": self._tool_reference_text(),
+            "tool_reference": self._tool_reference,
         }
         plan_text = self._planner_chain.invoke(payload)
         if not plan_text.strip():
@@ -247,14 +271,7 @@ class RemoteWorkflowChatBot:
                     )
                 continue
 
-            for identifier in targets:
-                try:
-                    result = adapter.run(identifier, dict(params))
-                except Exception as exc:  # pragma: no cover - defensive guard
-                    result = {
-                        "status": "Failed",
-                        "details": str(exc),
-                    }
+            for identifier, result in zip(targets, adapter.run_many(targets, params)):
                 result = self._post_process_result(tool_name, result)
                 records.append(
                     {
@@ -363,6 +380,16 @@ class RemoteWorkflowChatBot:
         return "\n".join(parts)
 
     def _build_tool_adapters(self) -> Dict[str, "RemoteToolAdapter"]:
+        from Remote.install.remote_tomcat_install import RemoteTomcatInstallTool
+        from Remote.install.remote_tomcat_uninstall import RemoteTomcatUninstallTool
+        from Remote.post_install.tomcat_start import RemoteTomcatStartTool
+        from Remote.post_install.tomcat_stop import RemoteTomcatStopTool
+        from Remote.post_install.tomcat_validation import RemoteTomcatValidationTool
+        from Remote.pre_install.remote_disk_check import RemoteDiskCheckTool
+        from Remote.pre_install.remote_java_install import RemoteJavaInstallTool
+        from Remote.pre_install.remote_port_check import RemotePortCheckTool
+        from Remote.pre_install.remote_ram_check import RemoteRamCheckTool
+
         adapters = [
             RemoteToolAdapter(RemoteDiskCheckTool(), self.settings_path, self.servers_path, self._logger),
             RemoteToolAdapter(RemoteRamCheckTool(), self.settings_path, self.servers_path, self._logger),
@@ -473,7 +500,7 @@ class RemoteWorkflowChatBot:
         if self._server_override is not None:
             return [dict(entry) for entry in self._server_override]
         try:
-            return load_server_ini(self.servers_path)
+            return [dict(entry) for entry in load_server_ini(self.servers_path)]
         except FileNotFoundError:
             return []
         except Exception:
@@ -637,7 +664,10 @@ class RemoteToolAdapter:
         self.settings_path = settings_path
         self.servers_path = servers_path
         self.logger = logger
+        from Tools.remote_workflow_tool import RemoteWorkflowTool
+
         self.is_workflow = isinstance(tool, RemoteWorkflowTool)
+        self._config_path = tuple(getattr(tool, "config_path", ()))
         self._run_signature = inspect.signature(tool.run)
         self._accepts_kwargs = any(
             param.kind == inspect.Parameter.VAR_KEYWORD
@@ -661,36 +691,52 @@ class RemoteToolAdapter:
             self.logger.info("TOOL %s -> %s", self.name, result.get("status"))
             return result
 
-        try:
-            servers = self._load_servers(servers_path)
-        except Exception as exc:
-            return {"status": "Failed", "details": str(exc)}
-        if not server_identifier:
-            return {"status": "Failed", "details": "No server specified for tool execution."}
-        server_info = self._select_server(servers, server_identifier)
-        if not server_info:
-            return {
-                "status": "Failed",
-                "details": f"Server '{server_identifier}' not found in inventory {servers_path}.",
+        overrides = {key: local_params[key] for key in _CONNECTION_OVERRIDES if local_params.get(key)}
+        if (
+            "host" in overrides
+            and "username" in overrides
+            and ("password" in overrides or "key_path" in overrides)
+        ):
+            # Host, user and credential all supplied: servers.ini has nothing to add
+            server_info: Optional[Dict[str, Any]] = {
+                "name": server_identifier or overrides["host"],
+                **overrides,
             }
+        else:
+            try:
+                _, server_index = self._load_servers(servers_path)
+            except Exception as exc:
+                return {"status": "Failed", "details": str(exc)}
+            if not server_identifier:
+                return {"status": "Failed", "details": "No server specified for tool execution."}
+            record = self._select_server(server_index, server_identifier)
+            if not record:
+                return {
+                    "status": "Failed",
+                    "details": f"Server '{server_identifier}' not found in inventory {servers_path}.",
+                }
+            # Inventory fills in whatever the overrides leave out (credentials, tomcat_home)
+            server_info = {**record, **overrides}
 
         host = local_params.pop("host", server_info.get("host"))
         username = local_params.pop("username", server_info.get("username"))
         password = local_params.pop("password", server_info.get("password")) or None
         key_path = local_params.pop("key_path", server_info.get("key_path")) or None
 
+        from Remote.remote_executor import RemoteExecutor
+
         executor = RemoteExecutor(host=host, username=username, password=password, key_path=key_path)
         try:
             executor.connect()
+            # load_yaml parses once per file mtime and hands back a private copy
             settings = load_yaml(settings_path)
-            config = self._resolve_config(settings, self.tool)
+            config, default_home = self._resolve_settings(settings)
             call_kwargs = dict(local_params)
             call_kwargs.setdefault("executor", executor)
             call_kwargs.setdefault("config", config)
             if self._allows_argument("server") and server_info is not None:
                 call_kwargs.setdefault("server", server_info)
             if self._allows_argument("tomcat_home"):
-                default_home = self._lookup_default_tomcat_home(settings)
                 call_kwargs.setdefault(
                     "tomcat_home",
                     (server_info or {}).get("tomcat_home") or default_home,
@@ -716,9 +762,31 @@ class RemoteToolAdapter:
         )
         return result
 
-    def _load_servers(self, servers_path: str) -> List[Dict[str, Any]]:
+    def run_many(
+        self, server_identifiers: Sequence[Optional[str]], params: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Run the tool against several servers concurrently; results follow input order."""
+        if len(server_identifiers) <= 1:
+            return [self._run_guarded(identifier, params) for identifier in server_identifiers]
+        # Each host has its own executor and pooled connection, so the SSH round trips overlap
+        workers = min(MAX_PARALLEL_TARGETS, len(server_identifiers))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda identifier: self._run_guarded(identifier, params), server_identifiers))
+
+    def _run_guarded(self, server_identifier: Optional[str], params: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return self.run(server_identifier, dict(params))
+        except Exception as exc:  # pragma: no cover - defensive guard
+            return {
+                "status": "Failed",
+                "details": str(exc),
+            }
+
+    def _load_servers(
+        self, servers_path: str
+    ) -> Tuple[Sequence[Mapping[str, Any]], Dict[str, Mapping[str, Any]]]:
         try:
-            return load_server_ini(servers_path)
+            return _cached_servers(servers_path)
         except Exception as exc:
             raise ValueError(f"Unable to read servers file {servers_path}: {exc}") from exc
 
@@ -745,20 +813,18 @@ class RemoteToolAdapter:
         return None
 
     def _select_server(
-        self, servers: Sequence[Dict[str, Any]], identifier: str
+        self, server_index: Mapping[str, Mapping[str, Any]], identifier: str
     ) -> Optional[Dict[str, Any]]:
-        normalized = identifier.strip().lower()
-        for record in servers:
-            name = str(record.get("name", "")).strip().lower()
-            host = str(record.get("host", "")).strip().lower()
-            if normalized in {name, host}:
-                return dict(record)
-        return None
+        record = server_index.get(identifier.strip().lower())
+        return dict(record) if record is not None else None
+
+    def _resolve_settings(self, settings: Dict[str, Any]) -> Tuple[Dict[str, Any], Optional[str]]:
+        """Return this tool's config section and the default Tomcat home."""
+        return self._resolve_config(settings), self._lookup_default_tomcat_home(settings)
 
-    def _resolve_config(self, settings: Dict[str, Any], tool: Any) -> Dict[str, Any]:
-        path = getattr(tool, "config_path", ())
+    def _resolve_config(self, settings: Dict[str, Any]) -> Dict[str, Any]:
         cursor: Any = settings
-        for key in path:
+        for key in self._config_path:
             if not isinstance(cursor, dict):
                 return {}
             cursor = cursor.get(key, {})
@@ -64,7 +64,7 @@ class ServerInventoryTool:
             "status": "Success",
             "details": summary,
             "command": f"load_server_ini({normalized_path})",
-            "servers": servers,
+            "servers": [dict(server) for server in servers],
         }
 
     def _normalize_path(self, raw_path: str) -> str:
@@ -4,11 +4,9 @@ from __future__ import annotations
 
 import argparse
 
-from RemoteAgent.chatbot import (
-    DEFAULT_SERVERS_PATH,
-    DEFAULT_SETTINGS_PATH,
-    RemoteWorkflowChatBot,
-)
+# Kept in sync with RemoteAgent.chatbot; importing it here would load LangChain just for --help
+DEFAULT_SETTINGS_PATH = "Remote/config/settings.yaml"
+DEFAULT_SERVERS_PATH = "Remote/config/servers.ini"
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -39,6 +37,8 @@ def build_parser() -> argparse.ArgumentParser:
 
 def main(argv: list[str] | None = None) -> None:
     args = build_parser().parse_args(argv)
+    from RemoteAgent.chatbot import RemoteWorkflowChatBot
+
     print("Initializing Remote Workflow ChatBot (LangChain)...\n")
     chatbot = RemoteWorkflowChatBot(
         model_name=args.model,